@@ -1,8 +1,8 @@
-from fastapi import APIRouter,  Depends
-from fastapi_pagination import Page, Params
-from fastapi_pagination.ext.sqlalchemy import paginate as sqlalchemy_paginate
+from fastapi import APIRouter,  Depends, Query
+from fastapi.responses import StreamingResponse
+from fastapi_pagination import Params
 
-from app.models.api import HackerNewsItemResponse, DataQueryParams
+from app.models.api import HackerNewsItemPage, DataQueryParams
 
 from app.services.data_service import data_service
 from app.core.config.logging import get_logger
@@ -16,12 +16,17 @@ router = APIRouter()
 
 @router.get(
     "/data",
-    response_model=Page[HackerNewsItemResponse],
+    response_model=HackerNewsItemPage,
     summary="Retrieve stored data",
     description="Get Hacker News data with filtering and pagination",
     dependencies=[Depends(get_rate_limit("data"))],
 )
-async def get_data(params: DataQueryParams = Depends(), pagination: Params = Depends(), db=Depends(get_db_session)):
+async def get_data(
+    params: DataQueryParams = Depends(),
+    pagination: Params = Depends(),
+    with_total: bool = Query(False, description="Count the total on pages after the first"),
+    db=Depends(get_db_session),
+):
     """
     Get Hacker News data with filtering and pagination.
     
@@ -35,8 +40,10 @@ async def get_data(params: DataQueryParams = Depends(), pagination: Params = Dep
     Pagination Parameters:
     - **page**: Page number (default: 1)
     - **size**: Items per page (default: 10, max: 100)
+    - **with_total**: Also count the total on pages after the first (default: false)
     
-    Returns paginated list of Hacker News items.
+    Returns paginated list of Hacker News items, streamed row by row. ``total`` and
+    ``pages`` are null on later pages unless ``with_total`` is set.
     """
     logger.info(f"Data request: {params.model_dump()}")
     
@@ -49,4 +56,7 @@ async def get_data(params: DataQueryParams = Depends(), pagination: Params = Dep
         order_direction=params.order_direction,
     )
 
-    return sqlalchemy_paginate(query, pagination)
+    return StreamingResponse(
+        data_service.stream_page(db, query, pagination.page, pagination.size, with_total),
+        media_type="application/json",
+    )
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Query, Depends
 
 from app.models.api import FetchRequest, FetchResponse
 
-from app.tasks.fetch_tasks import fetch_and_process_pipeline, get_task_status
+from app.tasks.fetch_tasks import enqueue_fetch_pipeline, get_task_status
 from app.core.utils import NotFoundException
 from app.core.config.logging import get_logger
 from app.core.config import get_rate_limit
@@ -30,16 +30,25 @@ async def fetch_data(request: FetchRequest = Query(...)):
     - **keyword**: Filter items by keyword in title
     - **limit**: Number of items to fetch (max 500)
 
-    Returns a task ID for tracking the fetch operation.
+    Returns a task ID for tracking the fetch operation. While an identical fetch is
+    still in flight, its task ID is returned instead of enqueuing a duplicate job.
     """
     logger.info(f"Starting fetch task with params: {request.model_dump()}")
 
-    # Start Celery task
-    task = fetch_and_process_pipeline.apply_async(args=[request.min_score, request.keyword, request.limit])
+    task_id, started = enqueue_fetch_pipeline(request.min_score, request.keyword, request.limit)
 
-    logger.info(f"Fetch task {task.id} accepted and queued")
+    if not started:
+        logger.info(f"Fetch task {task_id} already in progress for these params")
+        return FetchResponse(
+            task_id=task_id,
+            status="accepted",
+            message="Data fetching job already in progress",
+            timestamp=datetime.now(timezone.utc),
+        )
+
+    logger.info(f"Fetch task {task_id} accepted and queued")
     return FetchResponse(
-        task_id=task.id, status="accepted", message="Data fetching job started", timestamp=datetime.now(timezone.utc)
+        task_id=task_id, status="accepted", message="Data fetching job started", timestamp=datetime.now(timezone.utc)
     )
 
 
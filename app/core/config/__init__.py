@@ -1,14 +1,14 @@
 # Configuration module
 from .settings import settings
 from .database import SessionLocal, create_tables, get_db_session, Base, engine
-from .rate_limit import get_rate_limit, RATE_LIMITS, DEFAULT_RATE_LIMIT
+from .rate_limit import get_rate_limit, RATE_LIMITS, DEFAULT_RATE_LIMIT, init_rate_limiter
 from .redis import cache, AdvancedRedisCache, redis_health_check, cache_result
 from .logging import setup_logging, get_logger, logger
 from .http_client import get_http_client, create_shared_http_client
 
 __all__ = [
     "settings", "SessionLocal", "create_tables", "get_db_session", "Base", "engine",
-    "get_rate_limit", "RATE_LIMITS", "DEFAULT_RATE_LIMIT",
+    "get_rate_limit", "RATE_LIMITS", "DEFAULT_RATE_LIMIT", "init_rate_limiter",
     "cache", "AdvancedRedisCache", "redis_health_check", "setup_logging", "get_logger", "logger", "cache_result",
     "get_http_client", "create_shared_http_client"
 ]
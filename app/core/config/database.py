@@ -1,5 +1,5 @@
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event, MetaData
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
 from sqlalchemy.pool import StaticPool
 from .settings import settings
 from .logging import get_logger
@@ -14,11 +14,28 @@ engine = create_engine(
     echo=True,
 )
 
+
+if "sqlite" in settings.database_url and ":memory:" not in settings.database_url:
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL so the API and Celery workers can read while a task writes.
+
+        With WAL, synchronous=NORMAL only fsyncs at checkpoints instead of on every commit.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create Base class for models
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
+
 
 # Create metadata
 metadata = MetaData()
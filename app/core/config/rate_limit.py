@@ -1,5 +1,38 @@
+from fastapi_limiter import FastAPILimiter
 from fastapi_limiter.depends import RateLimiter
 
+# Token bucket evaluated atomically in one EVALSHA per request. RateLimiter passes
+# its `times` as ARGV[1] (bucket capacity) and window in ms as ARGV[2] (time to
+# refill a full bucket). Returns 0 when the request is allowed, otherwise the
+# number of milliseconds until the next token is available.
+TOKEN_BUCKET_LUA_SCRIPT = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local rate = capacity / period
+
+local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) / rate)
+end
+
+redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', key, period)
+return wait
+"""
+
+# Buckets are hashes, so keep them apart from the string counters of the default script
+TOKEN_BUCKET_PREFIX = "fastapi-limiter-tb"
+
 RATE_LIMITS = {
     "data": RateLimiter(times=60, seconds=60),
     "fetch": RateLimiter(times=10, seconds=60),
@@ -14,3 +47,9 @@ DEFAULT_RATE_LIMIT = RateLimiter(times=30, seconds=60)
 
 def get_rate_limit(endpoint_type: str) -> RateLimiter:
     return RATE_LIMITS.get(endpoint_type, DEFAULT_RATE_LIMIT)
+
+
+async def init_rate_limiter(redis_connection) -> None:
+    """Initialize FastAPILimiter with the token bucket script."""
+    FastAPILimiter.lua_script = TOKEN_BUCKET_LUA_SCRIPT
+    await FastAPILimiter.init(redis_connection, prefix=TOKEN_BUCKET_PREFIX)
@@ -19,6 +19,14 @@ redis_client = redis.Redis.from_url(
     health_check_interval=30,
 )
 
+# Delete KEYS[1] only while it still holds ARGV[1], atomically
+COMPARE_AND_DELETE_LUA_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
 
 class AdvancedRedisCache:
     """Advanced Redis caching utility with enhanced features."""
@@ -28,6 +36,7 @@ class AdvancedRedisCache:
         self.default_ttl = settings.cache_ttl_seconds
         self.cache_prefix = "hn_cache"
         self.stats = {"hits": 0, "misses": 0, "sets": 0, "deletes": 0}
+        self._compare_and_delete = self.client.register_script(COMPARE_AND_DELETE_LUA_SCRIPT)
 
     def _generate_key(self, key: str, namespace: Optional[str] = None) -> str:
         """Generate a cache key with namespace."""
@@ -61,6 +70,20 @@ class AdvancedRedisCache:
             logger.error(f"Cache SET error for {key}: {e}")
             return False
 
+    def add(self, key: str, value: Any, ttl: Optional[int] = None, namespace: Optional[str] = None) -> bool:
+        """Set a key-value pair only if the key does not already exist (SET NX)."""
+        try:
+            cache_key = self._generate_key(key, namespace)
+            serialized_value = self._serialize_value(value)
+            result = self.client.set(cache_key, serialized_value, ex=ttl or self.default_ttl, nx=True)
+            if result:
+                self.stats["sets"] += 1
+            logger.debug(f"Cache ADD: {cache_key} ({'stored' if result else 'exists'})")
+            return bool(result)
+        except Exception as e:
+            logger.error(f"Cache ADD error for {key}: {e}")
+            return False
+
     def get(self, key: str, namespace: Optional[str] = None) -> Optional[Any]:
         """Get a value from cache."""
         try:
@@ -93,6 +116,19 @@ class AdvancedRedisCache:
             logger.error(f"Cache DELETE error for {key}: {e}")
             return False
 
+    def delete_if_equals(self, key: str, value: Any, namespace: Optional[str] = None) -> bool:
+        """Delete a key only if it still holds the given value (compare-and-delete)."""
+        try:
+            cache_key = self._generate_key(key, namespace)
+            result = self._compare_and_delete(keys=[cache_key], args=[self._serialize_value(value)])
+            if result:
+                self.stats["deletes"] += 1
+            logger.debug(f"Cache DELETE_IF_EQUALS: {cache_key} ({'deleted' if result else 'kept'})")
+            return bool(result)
+        except Exception as e:
+            logger.error(f"Cache DELETE_IF_EQUALS error for {key}: {e}")
+            return False
+
     def exists(self, key: str, namespace: Optional[str] = None) -> bool:
         """Check if a key exists in cache."""
         try:
@@ -9,7 +9,7 @@ from fastapi_pagination import add_pagination
 from fastapi_limiter import FastAPILimiter
 from fastapi_limiter.depends import RateLimiter
 
-from app.core.config import settings, create_tables, redis_health_check, setup_logging, get_logger
+from app.core.config import settings, create_tables, redis_health_check, setup_logging, get_logger, init_rate_limiter
 from app.core.utils import setup_exception_handlers
 from app.api.routes import fetch, data
 
@@ -35,7 +35,7 @@ async def lifespan(app: FastAPI):
     # Initialize FastAPI Limiter
     try:
         redis_connection = redis.from_url(settings.redis_url, encoding="utf8", decode_responses=True)
-        await FastAPILimiter.init(redis_connection)
+        await init_rate_limiter(redis_connection)
         logger.info("FastAPI Limiter initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize FastAPI Limiter: {e}")
@@ -106,4 +106,12 @@ async def health_check():
 
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True, log_level=settings.log_level.lower())
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        loop="uvloop",
+        http="httptools",
+        log_level=settings.log_level.lower(),
+    )
@@ -1,25 +1,35 @@
-from typing import Optional, List
+from typing import Literal, Optional, List
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from datetime import datetime, timezone
 
 
 class HackerNewsItemResponse(BaseModel):
-    """Pydantic model for Hacker News item API response."""
+    """Pydantic model for Hacker News item API response; nullability mirrors the stored table."""
 
     id: int = Field(..., description="Unique identifier for the item")
     title: str = Field(..., description="Title of the item")
     url: Optional[str] = Field(None, description="URL of the item")
-    score: int = Field(..., description="Score/points of the item")
-    author: str = Field(..., description="Username of the author")
-    timestamp: int = Field(..., description="Unix timestamp when the item was created")
+    score: Optional[int] = Field(None, description="Score/points of the item")
+    author: Optional[str] = Field(None, description="Username of the author")
+    timestamp: Optional[int] = Field(None, description="Unix timestamp when the item was created")
     descendants: Optional[int] = Field(None, description="Number of comments")
     kids: Optional[List[int]] = Field(None, description="List of comment IDs")
-    type: str = Field(..., description="Type of item (story, comment, etc.)")
+    type: Optional[str] = Field(None, description="Type of item (story, comment, etc.)")
     text: Optional[str] = Field(None, description="Text content for text posts")
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class HackerNewsItemPage(BaseModel):
+    """Page of Hacker News items as streamed by the data endpoint."""
+
+    items: List[HackerNewsItemResponse] = Field(..., description="Items on this page")
+    total: Optional[int] = Field(None, description="Total matching items; null on later pages unless requested")
+    page: int = Field(..., description="Page number (1-based)")
+    size: int = Field(..., description="Items per page")
+    pages: Optional[int] = Field(None, description="Total number of pages; null whenever total is null")
+
+
 class FetchRequest(BaseModel):
     """Model for fetch request parameters."""
 
@@ -74,28 +84,15 @@ class DataQueryParams(BaseModel):
     item_id: Optional[int] = Field(None, description="Get specific item by ID")
     min_score: Optional[int] = Field(None, ge=0, description="Filter by minimum score")
     keyword: Optional[str] = Field(None, description="Filter by keyword in title")
-    order_by: str = Field("score", description="Order by field (score, time, id)")
-    order_direction: str = Field("desc", description="Order direction (asc, desc)")
+    order_by: Literal["score", "time", "id"] = Field("score", description="Order by field (score, time, id)")
+    order_direction: Literal["asc", "desc"] = Field("desc", description="Order direction (asc, desc)")
 
-    @field_validator("keyword")
+    @field_validator("keyword", mode="before")
     @classmethod
     def validate_keyword(cls, v):
-        if v is not None and v.strip() == "":
-            return None
-        return v
-
-    @field_validator("order_by")
-    @classmethod
-    def validate_order_by(cls, v):
-        if v not in ["score", "time", "id"]:
-            raise ValueError("order_by must be one of: score, time, id")
-        return v
-
-    @field_validator("order_direction")
-    @classmethod
-    def validate_order_direction(cls, v):
-        if v not in ["asc", "desc"]:
-            raise ValueError("order_direction must be one of: asc, desc")
+        # Strip surrounding whitespace; whitespace-only means no keyword filter
+        if isinstance(v, str):
+            return v.strip() or None
         return v
 
     model_config = ConfigDict(json_schema_extra={
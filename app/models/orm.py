@@ -1,4 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Index, Integer, String, Text, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
 from app.core.config import Base
 
 
@@ -6,18 +10,24 @@ class HackerNewsItem(Base):
     """SQLAlchemy model for Hacker News items."""
 
     __tablename__ = "hacker_news_items"
+    __table_args__ = (
+        # Serves ORDER BY score, id in either direction (and score range filters) from one index scan
+        Index("ix_hacker_news_items_score_id", "score", "id"),
+        # Same for ORDER BY timestamp, id
+        Index("ix_hacker_news_items_timestamp_id", "timestamp", "id"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(500), nullable=False, index=True)
-    url = Column(String(1000), nullable=True)
-    score = Column(Integer, nullable=True, index=True)
-    author = Column(String(100), nullable=True, index=True)
-    timestamp = Column(Integer, nullable=True, index=True)
-    descendants = Column(Integer, nullable=True)
-    type = Column(String(50), nullable=True, index=True)
-    text = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    title: Mapped[str] = mapped_column(String(500), nullable=False, index=True)
+    url: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    author: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)
+    timestamp: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    descendants: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, index=True)
+    text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
 
     def __repr__(self):
         return f"<HackerNewsItem(id={self.id}, title='{self.title[:50]}...')>"
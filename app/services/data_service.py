@@ -1,19 +1,80 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy import desc, asc
-from sqlalchemy.orm import Session
+from math import ceil
+from typing import List, Optional, Dict, Any, Iterator, Sequence
+from sqlalchemy import Insert, Select, func, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import InstrumentedAttribute, Session
 
 from app.models.orm import HackerNewsItem
-from app.models.api import StoreItemsResponse
+from app.models.api import StoreItemsResponse, HackerNewsItemResponse
 from app.core.config import get_logger
 
 logger = get_logger("data_service")
 
+# Rows per id lookup / upsert batch; keeps the IN (...) list under SQLite's bound-parameter limit
+STORE_BATCH_SIZE = 500
+
+# Response fields, resolved once. The response model's nullability mirrors the table,
+# so stored rows always fit it and the page serializer skips re-validation with model_construct
+_ITEM_RESPONSE_FIELDS = tuple(HackerNewsItemResponse.model_fields)
+
+# ORDER BY clauses for every (order_by, order_direction) pair, built once at import.
+# The id tie-breaker keeps pagination stable and runs in the same direction as the
+# primary key so a single scan of the (score, id) / timestamp indexes can serve the sort.
+_ORDERING = {
+    ("score", "desc"): (HackerNewsItem.score.desc(), HackerNewsItem.id.desc()),
+    ("score", "asc"): (HackerNewsItem.score.asc(), HackerNewsItem.id.asc()),
+    ("time", "desc"): (HackerNewsItem.timestamp.desc(), HackerNewsItem.id.desc()),
+    ("time", "asc"): (HackerNewsItem.timestamp.asc(), HackerNewsItem.id.asc()),
+    ("id", "desc"): (HackerNewsItem.id.desc(),),
+    ("id", "asc"): (HackerNewsItem.id.asc(),),
+}
+
+# Item columns written by store_items; id is the conflict key, timestamps are managed by the DB
+_STORED_FIELDS = ("title", "url", "score", "author", "timestamp", "descendants", "type", "text")
+_STORED_COLUMNS = tuple(getattr(HackerNewsItem, field) for field in _STORED_FIELDS)
+
+
+def _map_item(item_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an API item to database column values."""
+    return {
+        "id": item_data["id"],
+        "title": item_data["title"],
+        "url": item_data.get("url"),
+        "score": item_data.get("score"),
+        "author": item_data.get("author") or item_data.get("by"),  # Handle both "author" and "by"
+        "timestamp": item_data.get("timestamp") or item_data.get("time"),  # Handle both "timestamp" and "time"
+        "descendants": item_data.get("descendants"),
+        "type": item_data.get("type"),
+        "text": item_data.get("text"),
+    }
+
+
+def _build_upsert_statement() -> Insert:
+    """Build the INSERT that updates an existing id only where a stored column differs."""
+    # Core table rather than the entity, so a list of rows runs as a plain executemany
+    # (the ORM bulk path would not report rowcount)
+    stmt = sqlite_insert(HackerNewsItem.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[HackerNewsItem.id],
+        set_={**{field: stmt.excluded[field] for field in _STORED_FIELDS}, "updated_at": func.now()},
+        where=or_(*(column.is_distinct_from(stmt.excluded[column.key]) for column in _STORED_COLUMNS)),
+    )
+
+
+# Built once; executed with a list of row dicts, i.e. one cursor.executemany per batch
+_UPSERT_STATEMENT = _build_upsert_statement()
+
 
 class DataService:
     """Optimized data service with caching and query optimization."""
 
     def store_items(self, items: List[Dict[str, Any]], db: Session) -> StoreItemsResponse:
         """Store items in the database with bulk operations.
+
+        Items are written STORE_BATCH_SIZE at a time with one executemany of an
+        INSERT ... ON CONFLICT DO UPDATE whose WHERE guard lets the database skip
+        rows that have not changed; existing ids are only counted, to tell new
+        items from updates.
         
         Args:
             items: List of items to store
@@ -23,48 +84,33 @@ class DataService:
             StoreItemsResponse with detailed statistics about the operation.
         """
         try:
-            stored_count = 0
-            new_items = 0
-            updated_items = 0
-
-            # Use bulk operations for better performance
+            # Map API fields to database fields; a repeated id keeps its last occurrence
+            rows = {}
             for item_data in items:
-                # Map API fields to database fields
-                mapped_data = {
-                    "id": item_data["id"],
-                    "title": item_data["title"],
-                    "url": item_data.get("url"),
-                    "score": item_data.get("score"),
-                    "author": item_data.get("author") or item_data.get("by"),  # Handle both "author" and "by"
-                    "timestamp": item_data.get("timestamp") or item_data.get("time"),  # Handle both "timestamp" and "time"
-                    "descendants": item_data.get("descendants"),
-                    "type": item_data.get("type"),
-                    "text": item_data.get("text"),
-                }
-                
-                # Check if item already exists
-                existing_item = db.query(HackerNewsItem).filter(HackerNewsItem.id == mapped_data["id"]).first()
-
-                if existing_item:
-                    # Update existing item only if data has changed
-                    updated = False
-                    for key, value in mapped_data.items():
-                        if hasattr(existing_item, key) and getattr(existing_item, key) != value:
-                            setattr(existing_item, key, value)
-                            updated = True
-                    
-                    # Only count as stored if actually updated
-                    if updated:
-                        stored_count += 1
-                        updated_items += 1
-                else:
-                    # Create new item
-                    db_item = HackerNewsItem(**mapped_data)
-                    db.add(db_item)
-                    stored_count += 1
-                    new_items += 1
+                mapped_data = _map_item(item_data)
+                rows[mapped_data["id"]] = mapped_data
+
+            row_list = list(rows.values())
+            existing_count = 0
+            written = 0
+            for start in range(0, len(row_list), STORE_BATCH_SIZE):
+                batch = row_list[start:start + STORE_BATCH_SIZE]
+                existing_count += db.scalar(
+                    select(func.count())
+                    .select_from(HackerNewsItem)
+                    .where(HackerNewsItem.id.in_([row["id"] for row in batch]))
+                )
+                # rowcount covers inserted rows plus existing rows whose data actually changed
+                written += db.execute(_UPSERT_STATEMENT, batch).rowcount
 
             db.commit()
+            if written:
+                # Core writes bypass the identity map; make already-loaded items reload
+                db.expire_all()
+
+            new_items = len(rows) - existing_count
+            updated_items = written - new_items
+            stored_count = new_items + updated_items
             logger.info(f"Stored {stored_count} items in database (new: {new_items}, updated: {updated_items})")
 
             return StoreItemsResponse(
@@ -85,34 +131,22 @@ class DataService:
     ):
         """Build optimized query filters."""
         if item_id is not None:
-            query = query.filter(HackerNewsItem.id == item_id)
+            query = query.where(HackerNewsItem.id == item_id)
 
         if min_score is not None:
-            query = query.filter(HackerNewsItem.score >= min_score)
+            query = query.where(HackerNewsItem.score >= min_score)
 
         if keyword:
             # Use case-insensitive search with index optimization
-            query = query.filter(HackerNewsItem.title.ilike(f"%{keyword}%"))
+            query = query.where(HackerNewsItem.title.ilike(f"%{keyword}%"))
 
         return query
 
     def _build_query_ordering(self, query, order_by: str = "score", order_direction: str = "desc"):
         """Build optimized query ordering."""
-        if order_by == "score":
-            if order_direction == "desc":
-                query = query.order_by(desc(HackerNewsItem.score))
-            else:
-                query = query.order_by(asc(HackerNewsItem.score))
-        elif order_by == "time":
-            if order_direction == "desc":
-                query = query.order_by(desc(HackerNewsItem.timestamp))
-            else:
-                query = query.order_by(asc(HackerNewsItem.timestamp))
-        elif order_by == "id":
-            if order_direction == "desc":
-                query = query.order_by(desc(HackerNewsItem.id))
-            else:
-                query = query.order_by(asc(HackerNewsItem.id))
+        ordering = _ORDERING.get((order_by, order_direction))
+        if ordering:
+            query = query.order_by(*ordering)
 
         return query
 
@@ -124,22 +158,24 @@ class DataService:
         keyword: Optional[str] = None,
         order_by: str = "score",
         order_direction: str = "desc",
-    ):
-        """Get SQLAlchemy query for items with optimized filters and ordering.
+        columns: Optional[Sequence[InstrumentedAttribute]] = None,
+    ) -> Select:
+        """Get a SQLAlchemy Core select for items with optimized filters and ordering.
         
         Args:
-            db: Database session (injected dependency)
+            db: Database session (injected dependency); the statement is executed by the caller
             item_id: Optional item ID filter
             min_score: Optional minimum score filter
             keyword: Optional keyword filter
             order_by: Field to order by
             order_direction: Order direction (asc/desc)
+            columns: Optional column projection; rows then hold only these columns instead of ORM entities
             
         Returns:
-            SQLAlchemy query object
+            SQLAlchemy Select statement
         """
         # Build base query with optimizations
-        query = db.query(HackerNewsItem)
+        query = select(*columns) if columns else select(HackerNewsItem)
 
         # Apply filters
         query = self._build_query_filters(query, item_id, min_score, keyword)
@@ -151,6 +187,52 @@ class DataService:
 
         return query
 
+    def stream_page(
+        self, db: Session, query: Select, page: int, size: int, with_total: bool = False
+    ) -> Iterator[bytes]:
+        """Stream one page of a query as a JSON ``HackerNewsItemPage`` document.
+        
+        The total is only counted for the first page or when explicitly requested,
+        since ``COUNT(*)`` scans the whole filtered set; otherwise ``total`` and
+        ``pages`` are null. Both the count and the page query run here, before the
+        iterator is returned, so database errors surface before the response starts
+        and the session is not used after the request's dependencies are torn down.
+        Only the JSON serialization of the loaded rows is streamed.
+        
+        Args:
+            db: Database session owned by the caller; it is not closed here
+            query: Select statement from get_items_query
+            page: Page number (1-based)
+            size: Items per page
+            with_total: Count the total even when page > 1
+            
+        Returns:
+            Iterator of JSON byte chunks
+        """
+        total = None
+        if page == 1 or with_total:
+            total = db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        items = db.scalars(query.offset((page - 1) * size).limit(size)).all()
+        return self._iter_page_json(items, total, page, size)
+
+    def _iter_page_json(
+        self, items: Sequence[HackerNewsItem], total: Optional[int], page: int, size: int
+    ) -> Iterator[bytes]:
+        """Yield the JSON framing and already-loaded items of a page, one item at a time."""
+        yield b'{"items":['
+        for index, item in enumerate(items):
+            if index:
+                yield b","
+            response_item = HackerNewsItemResponse.model_construct(
+                **{field: getattr(item, field, None) for field in _ITEM_RESPONSE_FIELDS}
+            )
+            yield response_item.model_dump_json().encode()
+        if total is None:
+            total_json = pages_json = "null"
+        else:
+            total_json, pages_json = total, ceil(total / size) if size else 0
+        yield f'],"total":{total_json},"page":{page},"size":{size},"pages":{pages_json}}}'.encode()
+
 
 # Create data service instance
 data_service = DataService()
@@ -2,17 +2,90 @@ import asyncio
 import httpx
 from typing import List, Optional, Dict, Any
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from app.core.config import settings, cache_result, get_logger
+from app.core.config import settings, cache_result, get_logger, create_shared_http_client
 
 
 logger = get_logger("hacker_news_client")
 
 
+def transform_item_fields(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform API response fields to match our database schema."""
+    transformed = item.copy()
+
+    # Transform "by" to "author"
+    if "by" in transformed:
+        transformed["author"] = transformed.pop("by")
+
+    # Transform "time" to "timestamp"
+    if "time" in transformed:
+        transformed["timestamp"] = transformed.pop("time")
+
+    return transformed
+
+
+def filter_items(
+    items: List[Dict[str, Any]], *, min_score: Optional[int] = None, keyword: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Filter items based on criteria.
+
+    Filtering and field transformation happen in a single pass, and only
+    items that pass the filters are copied/transformed. Each combination of
+    criteria gets its own comprehension so no path evaluates an unused predicate.
+
+    With no criteria (a blank keyword counts as none) the input list itself is
+    returned, without a copy or transformation; items from get_items_batch are
+    already transformed by get_item. Callers that need isolation must copy.
+    """
+    if keyword is not None and not keyword.strip():
+        keyword = None
+
+    if min_score is None and keyword is None:
+        return items
+
+    transform = transform_item_fields
+
+    if min_score is not None and keyword is not None:
+        keyword_lower = keyword.lower()
+        return [
+            transform(item)
+            for item in items
+            if (item.get("score") or 0) >= min_score and keyword_lower in (item.get("title") or "").lower()
+        ]
+
+    if min_score is not None:
+        return [transform(item) for item in items if (item.get("score") or 0) >= min_score]
+
+    keyword_lower = keyword.lower()
+    return [transform(item) for item in items if keyword_lower in (item.get("title") or "").lower()]
+
+
 class HackerNewsAPIClient:
     """Client for interacting with Hacker News API."""
 
     def __init__(self):
         self.base_url = settings.hacker_news_api_base_url
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the long-lived pooled HTTP client, creating it on first use.
+
+        The pool is tied to the event loop it was created on, so a new client is
+        opened when called from a different loop. A client assigned to _client
+        from outside is used as-is.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or (self._client_loop is not None and self._client_loop is not loop):
+            self._client = create_shared_http_client()
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
     @cache_result(ttl=settings.cache_ttl_seconds, namespace="hn")
     @retry(
@@ -25,20 +98,19 @@ class HackerNewsAPIClient:
         url = f"{self.base_url}/topstories.json"
         logger.info(f"Fetching top stories with limit={limit}")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url)
-                response.raise_for_status()
-                all_story_ids = response.json()
-                story_ids = all_story_ids[:limit]
-                logger.info(f"Successfully fetched {len(story_ids)} story IDs")
-                return story_ids
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error fetching top stories: {e.response.status_code}")
-                raise
-            except httpx.RequestError as e:
-                logger.error(f"Request error fetching top stories: {e}")
-                raise
+        try:
+            response = await self._get_client().get(url)
+            response.raise_for_status()
+            all_story_ids = response.json()
+            story_ids = all_story_ids[:limit]
+            logger.info(f"Successfully fetched {len(story_ids)} story IDs")
+            return story_ids
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error fetching top stories: {e.response.status_code}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"Request error fetching top stories: {e}")
+            raise
 
     @cache_result(ttl=settings.cache_ttl_seconds, namespace="hn")
     @retry(
@@ -51,23 +123,22 @@ class HackerNewsAPIClient:
         url = f"{self.base_url}/item/{item_id}.json"
         logger.debug(f"Fetching item {item_id}")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url)
-                response.raise_for_status()
-                item_data = response.json()
-                
-                if item_data:
-                    transformed_item = self.transform_item_fields(item_data)
-                    logger.debug(f"Successfully fetched item {item_id}")
-                    return transformed_item
-                return None
-            except httpx.HTTPStatusError as e:
-                logger.warning(f"HTTP error fetching item {item_id}: {e.response.status_code}")
-                raise
-            except httpx.RequestError as e:
-                logger.warning(f"Request error fetching item {item_id}: {e}")
-                raise
+        try:
+            response = await self._get_client().get(url)
+            response.raise_for_status()
+            item_data = response.json()
+            
+            if item_data:
+                transformed_item = transform_item_fields(item_data)
+                logger.debug(f"Successfully fetched item {item_id}")
+                return transformed_item
+            return None
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"HTTP error fetching item {item_id}: {e.response.status_code}")
+            raise
+        except httpx.RequestError as e:
+            logger.warning(f"Request error fetching item {item_id}: {e}")
+            raise
 
     async def get_items_batch(self, item_ids: List[int]) -> List[Dict[str, Any]]:
         """Get multiple items in batch with controlled concurrency."""
@@ -104,37 +175,13 @@ class HackerNewsAPIClient:
 
     def transform_item_fields(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Transform API response fields to match our database schema."""
-        transformed = item.copy()
-        
-        # Transform "by" to "author"
-        if "by" in transformed:
-            transformed["author"] = transformed.pop("by")
-        
-        # Transform "time" to "timestamp"
-        if "time" in transformed:
-            transformed["timestamp"] = transformed.pop("time")
-        
-        return transformed
+        return transform_item_fields(item)
 
     def filter_items(
         self, items: List[Dict[str, Any]], min_score: Optional[int] = None, keyword: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Filter items based on criteria."""
-        # Transform all items first
-        transformed_items = [self.transform_item_fields(item) for item in items]
-        
-        filtered_items = transformed_items
-
-        # Filter by minimum score
-        if min_score is not None:
-            filtered_items = [item for item in filtered_items if item.get("score", 0) >= min_score]
-
-        # Filter by keyword in title
-        if keyword:
-            keyword_lower = keyword.lower()
-            filtered_items = [item for item in filtered_items if keyword_lower in item.get("title", "").lower()]
-
-        return filtered_items
+        """Filter items based on criteria; see the module-level filter_items."""
+        return filter_items(items, min_score=min_score, keyword=keyword)
 
 
 # Create hacker news client instance
@@ -1,8 +1,10 @@
 import asyncio
+import os
+import threading
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
-from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
 import atexit
+from uuid import uuid4
 
 from app.tasks.celery_app import celery_app
 from app.services.hacker_news_client import hacker_news_client
@@ -11,20 +13,49 @@ from app.core.config import cache, get_logger, SessionLocal
 
 logger = get_logger("celery_tasks")
 
-executor = ThreadPoolExecutor(max_workers=4)  # adjust max_workers based on the number of cores
+# How long an in-flight fetch blocks identical requests if the pipeline never releases it
+FETCH_LOCK_TTL_SECONDS = 60
+
+# Background event loop shared by all tasks in this worker process, so the HN client's
+# pooled connections survive between calls instead of dying with a per-call asyncio.run loop
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the worker's background event loop, starting it on first use (or after a fork)."""
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name="hn-event-loop", daemon=True).start()
+        return _loop
 
 
 def run_async_in_thread(async_func, *args, **kwargs):
     """
-    Utility: run async function in sync context using a global thread pool.
+    Utility: run async function in sync context on the shared background event loop.
     """
-    return executor.submit(asyncio.run, async_func(*args, **kwargs)).result()
+    return asyncio.run_coroutine_threadsafe(async_func(*args, **kwargs), _get_event_loop()).result()
 
 
-# Register shutdown function to ensure the thread pool is closed when the application exits
+# Register shutdown function to ensure the HTTP pool and event loop are closed when the application exits
 @atexit.register
-def shutdown_executor():
-    executor.shutdown(wait=True)
+def shutdown_event_loop():
+    if _loop is None or _loop_pid != os.getpid() or not _loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(hacker_news_client.aclose(), _loop).result(timeout=5)
+    except Exception as e:
+        logger.error(f"Failed to close HTTP client: {e}")
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+async def _fetch_top_stories_impl(limit: int) -> List[int]:
+    """Fetch top story IDs; the async core of fetch_top_stories, callable without Celery."""
+    return await hacker_news_client.get_top_stories(limit=limit)
 
 
 @celery_app.task(bind=True, name="app.tasks.fetch_tasks.fetch_top_stories")
@@ -42,7 +73,7 @@ def fetch_top_stories(self, limit: int = 100) -> List[int]:
     logger.info(f"Starting fetch_top_stories task {task_id} with limit={limit}")
 
     try:
-        story_ids = run_async_in_thread(hacker_news_client.get_top_stories, limit=limit)
+        story_ids = run_async_in_thread(_fetch_top_stories_impl, limit)
         logger.info(f"Task {task_id} completed: fetched {len(story_ids)} story IDs")
         return story_ids
 
@@ -174,6 +205,10 @@ def fetch_and_process_pipeline(
         update_task_status(task_id, "failed", 0, error_msg)
         raise
 
+    finally:
+        # Only the run that holds the lock may release it; direct calls (e.g. scheduled runs) never do
+        release_fetch_lock(min_score, keyword, limit, task_id)
+
 
 @celery_app.task(bind=True, name="app.tasks.fetch_tasks.scheduled_fetch_task")
 def scheduled_fetch_task(
@@ -246,3 +281,50 @@ def get_task_status(task_id: str) -> Optional[Dict[str, Any]]:
     except Exception as e:
         logger.error(f"Failed to get task status for {task_id}: {e}")
         return None
+
+
+def _fetch_lock_key(min_score: Optional[int], keyword: Optional[str], limit: int) -> str:
+    """Build the in-flight lock key for a fetch with the given parameters."""
+    return f"fetch:lock:{min_score}:{keyword}:{limit}"
+
+
+def enqueue_fetch_pipeline(min_score: Optional[int], keyword: Optional[str], limit: int) -> Tuple[str, bool]:
+    """
+    Enqueue the fetch pipeline unless an identical fetch is already in flight.
+
+    The task ID is generated up front and claimed as the lock value with SET NX,
+    so a concurrent caller that loses the race immediately sees the winner's
+    task ID and returns it instead of enqueuing a duplicate job.
+
+    Args:
+        min_score: Minimum score filter
+        keyword: Keyword filter
+        limit: Number of stories to fetch
+
+    Returns:
+        Tuple of (task_id, started), where started is False when an in-flight task was reused
+    """
+    lock_key = _fetch_lock_key(min_score, keyword, limit)
+    task_id = str(uuid4())
+    if not cache.add(lock_key, task_id, ttl=FETCH_LOCK_TTL_SECONDS):
+        existing_task_id = cache.get(lock_key)
+        if existing_task_id:
+            return existing_task_id, False
+
+    try:
+        fetch_and_process_pipeline.apply_async(args=[min_score, keyword, limit], task_id=task_id)
+    except Exception:
+        release_fetch_lock(min_score, keyword, limit, task_id)
+        raise
+
+    return task_id, True
+
+
+def release_fetch_lock(min_score: Optional[int], keyword: Optional[str], limit: int, task_id: Optional[str]):
+    """Release the in-flight lock if task_id still holds it, so a new fetch with the same parameters can start."""
+    if task_id is None:
+        return
+    try:
+        cache.delete_if_equals(_fetch_lock_key(min_score, keyword, limit), task_id)
+    except Exception as e:
+        logger.error(f"Failed to release fetch lock: {e}")
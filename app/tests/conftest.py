@@ -1,14 +1,18 @@
+import copy
 import pytest
 import os
+import uvloop
 from typing import Optional
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import DEFAULT, patch
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from fastapi_limiter import FastAPILimiter
+from sqlalchemy import create_engine, event, insert
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.core.config.database import Base, get_db_session
+from app.models.orm import HackerNewsItem
 from app.services.data_service import DataService
 from app.tasks.fetch_tasks import celery_app
 
@@ -30,8 +34,37 @@ test_engine = create_engine(
     echo=False,
 )
 
+
+@event.listens_for(test_engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    """Let SQLAlchemy issue BEGIN itself so SAVEPOINTs work on SQLite."""
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(test_engine, "begin")
+def _emit_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", default=False, help="run tests marked slow")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: benchmark-style test, only run with --runslow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --runslow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 # Create test session
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=test_engine)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -48,6 +81,20 @@ def disable_rate_limiting():
         yield
 
 
+@pytest.fixture
+def fastapi_limiter_state(monkeypatch):
+    """Restore FastAPILimiter's class-level configuration after a test initializes it."""
+    for name in ("redis", "prefix", "lua_sha", "lua_script", "identifier", "http_callback", "ws_callback"):
+        monkeypatch.setattr(FastAPILimiter, name, getattr(FastAPILimiter, name))
+    return FastAPILimiter
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop, the event loop used in production."""
+    return uvloop.EventLoopPolicy()
+
+
 @pytest.fixture(scope="function")
 def mock_cache():
     """Mock cache for individual tests."""
@@ -64,6 +111,13 @@ def mock_cache():
             cache_storage[full_key] = value
             return True
         
+        def add(self, key: str, value, ttl: Optional[int] = None, namespace: str = "default"):
+            full_key = f"{namespace}:{key}"
+            if full_key in cache_storage:
+                return False
+            cache_storage[full_key] = value
+            return True
+        
         def delete(self, key: str, namespace: str = "default"):
             full_key = f"{namespace}:{key}"
             if full_key in cache_storage:
@@ -71,6 +125,13 @@ def mock_cache():
                 return True
             return False
         
+        def delete_if_equals(self, key: str, value, namespace: str = "default"):
+            full_key = f"{namespace}:{key}"
+            if cache_storage.get(full_key) == value:
+                del cache_storage[full_key]
+                return True
+            return False
+        
         def clear(self):
             cache_storage.clear()
     
@@ -82,19 +143,71 @@ def mock_cache():
             yield mock_cache_instance
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database session for each test."""
-    # Drop and recreate tables to ensure clean state
+@pytest.fixture(scope="session")
+def test_schema():
+    """Create the database schema once for the whole test session.
+
+    The in-memory database always starts empty (one per process, including each
+    xdist worker), so the per-table existence checks are skipped.
+    """
+    Base.metadata.create_all(bind=test_engine, checkfirst=False)
+    yield
     Base.metadata.drop_all(bind=test_engine)
-    Base.metadata.create_all(bind=test_engine)
+
+
+@pytest.fixture(scope="function")
+def db_session(test_schema):
+    """Database session whose changes are rolled back after each test.
     
-    # Create session
-    session = TestingSessionLocal()
+    The session joins an outer transaction through a SAVEPOINT, so commits and
+    rollbacks made by the code under test never reach the outer transaction.
+    """
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def seed_items(db_session):
+    """Bulk-insert item rows (dicts of column values) in a single executemany."""
+    def _seed(rows):
+        db_session.execute(insert(HackerNewsItem), rows)
+        db_session.commit()
+    return _seed
+
+
+# Shared read-only rows for the parametrized query tests (see seeded_session)
+STANDARD_SEED = (
+    {"id": 1, "title": "Python Tutorial", "score": 50, "author": "user1", "timestamp": 1640995200, "type": "story"},
+    {"id": 2, "title": "JavaScript Guide", "score": 200, "author": "user2", "timestamp": 1640995400, "type": "story"},
+    {"id": 3, "title": "Python Best Practices", "score": 150, "author": "user3", "timestamp": 1640995300, "type": "story"},
+    {"id": 4, "title": "Python Deep Dive", "score": 100, "author": "user4", "timestamp": 1640995500, "type": "story"},
+)
+
+
+@pytest.fixture(scope="class")
+def seeded_session(test_schema):
+    """Session holding STANDARD_SEED, inserted once per test class and rolled back afterwards.
+
+    For read-only tests only. The in-memory engine has a single connection, so
+    a class using this fixture must not also use db_session.
+    """
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    session.execute(insert(HackerNewsItem), list(STANDARD_SEED))
     try:
         yield session
     finally:
         session.close()
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture
@@ -106,8 +219,15 @@ def fake_data_service(db_session):
     return service
 
 
+@pytest.fixture(scope="session")
+def app_client():
+    """One TestClient for the whole session, so app startup/shutdown runs once."""
+    with TestClient(app) as client:
+        yield client
+
+
 @pytest.fixture
-def test_client(db_session, mock_cache):
+def test_client(app_client, db_session, mock_cache):
     """Test client with dependency overrides."""
     def override_get_db():
         try:
@@ -118,20 +238,20 @@ def test_client(db_session, mock_cache):
     # Override the database dependency
     app.dependency_overrides[get_db_session] = override_get_db
     
-    with TestClient(app) as client:
-        yield client
+    yield app_client
     
     app.dependency_overrides.clear()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def celery_test_app():
-    """Test Celery app configuration."""
+    """Test Celery app configuration, applied once per session; tests must not change it."""
     celery_app.conf.update({
         'task_always_eager': True,  # Execute tasks synchronously
         'task_eager_propagates': True,  # Propagate exceptions
+        'task_store_eager_result': False,  # Don't write eager results to the backend
         'broker_url': 'memory://',  # Use in-memory broker
-        'result_backend': 'rpc://',  # Use RPC result backend
+        'result_backend': 'cache+memory://',  # In-process result backend, no broker codec
     })
     return celery_app
 
@@ -148,8 +268,24 @@ def mock_session_local_for_tasks(db_session, monkeypatch):
 
 
 @pytest.fixture
-def sample_hacker_news_items():
-    """Sample Hacker News items for testing."""
+def pipeline_mocks(mock_cache):
+    """Patch the pipeline's sub-tasks and status updates in one go; yields the mocks by name.
+
+    Depends on mock_cache so the pipeline's fetch-lock release never reaches Redis.
+    """
+    with patch.multiple(
+        "app.tasks.fetch_tasks",
+        fetch_top_stories=DEFAULT,
+        fetch_item_details=DEFAULT,
+        process_and_store_items=DEFAULT,
+        update_task_status=DEFAULT,
+    ) as mocks:
+        yield mocks
+
+
+@pytest.fixture(scope="session")
+def _sample_items_template():
+    """Sample item dicts, built once per session; tests get copies via sample_hacker_news_items."""
     return [
         {
             "id": 1,
@@ -187,4 +323,10 @@ def sample_hacker_news_items():
     ]
 
 
+@pytest.fixture
+def sample_hacker_news_items(_sample_items_template):
+    """Sample Hacker News items for testing (a fresh deep copy, safe to mutate)."""
+    return copy.deepcopy(_sample_items_template)
+
+
 
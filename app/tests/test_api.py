@@ -1,6 +1,4 @@
-import pytest
-from unittest.mock import patch, MagicMock
-from app.models.orm import HackerNewsItem
+from unittest.mock import patch
 from app.main import app
 from app.core.config.database import get_db_session
 
@@ -10,12 +8,7 @@ class TestFetchAPI:
     
     def test_fetch_data_success(self, test_client, celery_test_app):
         """Test successful fetch data request."""
-        mock_task = MagicMock()
-        mock_task.id = "test-task-123"
-        
         with patch('app.tasks.fetch_tasks.fetch_and_process_pipeline.apply_async') as mock_apply_async:
-            mock_apply_async.return_value = mock_task
-            
             response = test_client.post(
                 "/api/v1/fetch",
                 params={
@@ -29,13 +22,26 @@ class TestFetchAPI:
         assert response.status_code in [202, 429]
         if response.status_code == 202:
             data = response.json()
-            assert data["task_id"] == "test-task-123"
             assert data["status"] == "accepted"
             assert data["message"] == "Data fetching job started"
             assert "timestamp" in data
             
-            # Verify Celery task was called with correct parameters
-            mock_apply_async.assert_called_once_with(args=[100, "Python", 50])
+            # Verify Celery task was enqueued under the returned task ID
+            mock_apply_async.assert_called_once_with(args=[100, "Python", 50], task_id=data["task_id"])
+    
+    def test_fetch_data_deduplicates_inflight_requests(self, test_client, celery_test_app):
+        """Test identical fetch requests reuse the in-flight task instead of enqueuing again."""
+        params = {"min_score": 100, "keyword": "Python", "limit": 50}
+        
+        with patch('app.tasks.fetch_tasks.fetch_and_process_pipeline.apply_async') as mock_apply_async:
+            first = test_client.post("/api/v1/fetch", params=params)
+            second = test_client.post("/api/v1/fetch", params=params)
+        
+        assert first.status_code == 202
+        assert second.status_code == 202
+        assert second.json()["task_id"] == first.json()["task_id"]
+        assert second.json()["status"] == "accepted"
+        mock_apply_async.assert_called_once_with(args=[100, "Python", 50], task_id=first.json()["task_id"])
     
     def test_fetch_data_invalid_parameters(self, test_client):
         """Test fetch data request with invalid parameters."""
@@ -90,15 +96,12 @@ class TestFetchAPI:
 class TestDataAPI:
     """Test data API endpoints - core functionality only."""
     
-    def test_get_data_basic(self, test_client, db_session, fake_data_service):
+    def test_get_data_basic(self, test_client, seed_items):
         """Test basic data retrieval without filters."""
-        items = [
-            HackerNewsItem(id=1, title="Story 1", score=100, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="Story 2", score=200, author="user2", timestamp=1640995300, type="story"),
-        ]
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
+        seed_items([
+            {"id": 1, "title": "Story 1", "score": 100, "author": "user1", "timestamp": 1640995200, "type": "story"},
+            {"id": 2, "title": "Story 2", "score": 200, "author": "user2", "timestamp": 1640995300, "type": "story"},
+        ])
         
         response = test_client.get("/api/v1/data", params={"page": 1, "size": 10})
         
@@ -114,16 +117,13 @@ class TestDataAPI:
         assert items_data[0]["id"] == 2  # Higher score first
         assert items_data[1]["id"] == 1
     
-    def test_get_data_with_filters(self, test_client, db_session, fake_data_service):
+    def test_get_data_with_filters(self, test_client, seed_items):
         """Test data retrieval with filters."""
-        items = [
-            HackerNewsItem(id=1, title="Python Tutorial", score=50, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="JavaScript Guide", score=100, author="user2", timestamp=1640995300, type="story"),
-            HackerNewsItem(id=3, title="Python Best Practices", score=150, author="user3", timestamp=1640995400, type="story"),
-        ]
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
+        seed_items([
+            {"id": 1, "title": "Python Tutorial", "score": 50, "author": "user1", "timestamp": 1640995200, "type": "story"},
+            {"id": 2, "title": "JavaScript Guide", "score": 100, "author": "user2", "timestamp": 1640995300, "type": "story"},
+            {"id": 3, "title": "Python Best Practices", "score": 150, "author": "user3", "timestamp": 1640995400, "type": "story"},
+        ])
         
         response = test_client.get(
             "/api/v1/data",
@@ -144,11 +144,11 @@ class TestDataAPI:
         assert items_data[0]["title"] == "Python Best Practices"
         assert items_data[0]["score"] == 150
     
-    def test_get_data_by_id(self, test_client, db_session, fake_data_service):
+    def test_get_data_by_id(self, test_client, seed_items):
         """Test getting specific item by ID."""
-        item = HackerNewsItem(id=12345, title="Specific Story", score=100, author="user1", timestamp=1640995200, type="story")
-        db_session.add(item)
-        db_session.commit()
+        seed_items([
+            {"id": 12345, "title": "Specific Story", "score": 100, "author": "user1", "timestamp": 1640995200, "type": "story"},
+        ])
         
         response = test_client.get("/api/v1/data", params={"item_id": 12345, "page": 1, "size": 10})
         
@@ -160,23 +160,19 @@ class TestDataAPI:
         assert items_data[0]["id"] == 12345
         assert items_data[0]["title"] == "Specific Story"
     
-    def test_get_data_pagination(self, test_client, db_session, fake_data_service):
+    def test_get_data_pagination(self, test_client, seed_items):
         """Test data retrieval with pagination."""
-        items = []
-        for i in range(15):
-            item = HackerNewsItem(
-                id=i+1,
-                title=f"Story {i+1}",
-                score=100 + i,
-                author=f"user{i+1}",
-                timestamp=1640995200 + i,
-                type="story"
-            )
-            items.append(item)
-        
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
+        seed_items([
+            {
+                "id": i + 1,
+                "title": f"Story {i + 1}",
+                "score": 100 + i,
+                "author": f"user{i + 1}",
+                "timestamp": 1640995200 + i,
+                "type": "story",
+            }
+            for i in range(15)
+        ])
         
         # Test first page
         response = test_client.get("/api/v1/data", params={"page": 1, "size": 5})
@@ -187,6 +183,7 @@ class TestDataAPI:
         assert data["page"] == 1
         assert data["size"] == 5
         assert data["total"] == 15
+        assert data["pages"] == 3
         
         # Test second page
         response = test_client.get("/api/v1/data", params={"page": 2, "size": 5})
@@ -195,6 +192,15 @@ class TestDataAPI:
         data = response.json()
         assert len(data["items"]) == 5
         assert data["page"] == 2
+        assert data["total"] is None
+        
+        # Later pages only count the total on request
+        response = test_client.get("/api/v1/data", params={"page": 2, "size": 5, "with_total": True})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 15
+        assert data["pages"] == 3
     
     def test_get_data_empty_database(self, test_client):
         """Test data retrieval from empty database."""
@@ -256,8 +262,8 @@ class TestErrorHandling:
     
     def test_celery_task_error(self, test_client):
         """Test handling of Celery task errors."""
-        with patch('app.tasks.fetch_tasks.fetch_and_process_pipeline.apply_async') as mock_apply_async:
-            mock_apply_async.side_effect = Exception("Celery error")
+        with patch('app.api.routes.fetch.enqueue_fetch_pipeline') as mock_enqueue:
+            mock_enqueue.side_effect = Exception("Celery error")
             
             # The exception should be raised and not caught by the API
             # This is expected behavior since the API doesn't have error handling for Celery task failures
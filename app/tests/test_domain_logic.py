@@ -1,58 +1,102 @@
 import pytest
-from app.models.api import DataQueryParams
+from app.models.api import DataQueryParams, FetchRequest
 from app.services.hacker_news_client import HackerNewsAPIClient
 
 
 class TestDataQueryParamsCustomValidation:
     """Test only the custom validation logic in DataQueryParams."""
     
-    def test_keyword_validation_empty_string(self):
-        """Test custom keyword validation for empty string."""
-        params = DataQueryParams(keyword="   ")
-        assert params.keyword is None
+    @pytest.mark.parametrize("keyword, expected", [
+        ("   ", None),
+        ("  \t\n  ", None),
+        ("python", "python"),
+        ("  python \n", "python"),
+    ])
+    def test_keyword_validation(self, keyword, expected):
+        """Test custom keyword validation strips whitespace and maps blank to None."""
+        params = DataQueryParams(keyword=keyword)
+        assert params.keyword == expected
     
-    def test_keyword_validation_whitespace_only(self):
-        """Test custom keyword validation for whitespace-only string."""
-        params = DataQueryParams(keyword="  \t\n  ")
-        assert params.keyword is None
+    @pytest.mark.parametrize("kwargs, message", [
+        ({"min_score": -1}, "greater than or equal to 0"),
+        ({"order_by": "invalid"}, "Input should be 'score', 'time' or 'id'"),
+        ({"order_direction": "invalid"}, "Input should be 'asc' or 'desc'"),
+    ])
+    def test_invalid_values(self, kwargs, message):
+        """Test invalid query parameters are rejected."""
+        with pytest.raises(ValueError, match=message):
+            DataQueryParams(**kwargs)
     
-    def test_keyword_validation_normal_string(self):
-        """Test custom keyword validation for normal string."""
-        params = DataQueryParams(keyword="python")
-        assert params.keyword == "python"
-    
-    def test_order_by_validation_invalid_value(self):
-        """Test custom order_by validation."""
-        with pytest.raises(ValueError, match="order_by must be one of"):
-            DataQueryParams(order_by="invalid")
-    
-    def test_order_by_validation_valid_values(self):
-        """Test custom order_by validation with valid values."""
-        valid_values = ["score", "time", "id"]
-        for value in valid_values:
-            params = DataQueryParams(order_by=value)
-            assert params.order_by == value
-    
-    def test_order_direction_validation_invalid_value(self):
-        """Test custom order_direction validation."""
-        with pytest.raises(ValueError, match="order_direction must be one of"):
-            DataQueryParams(order_direction="invalid")
+    @pytest.mark.parametrize("field, value", [
+        ("order_by", "score"),
+        ("order_by", "time"),
+        ("order_by", "id"),
+        ("order_direction", "asc"),
+        ("order_direction", "desc"),
+    ])
+    def test_ordering_valid_values(self, field, value):
+        """Test ordering validation accepts every allowed value."""
+        params = DataQueryParams(**{field: value})
+        assert getattr(params, field) == value
+
+
+class TestFetchRequestValidation:
+    """Test field constraints on FetchRequest."""
     
-    def test_order_direction_validation_valid_values(self):
-        """Test custom order_direction validation with valid values."""
-        valid_values = ["asc", "desc"]
-        for value in valid_values:
-            params = DataQueryParams(order_direction=value)
-            assert params.order_direction == value
+    @pytest.mark.parametrize("kwargs", [
+        {"min_score": -1},
+        {"limit": 0},
+        {"limit": 501},
+        {"keyword": ""},
+    ])
+    def test_invalid_values(self, kwargs):
+        """Test out-of-range fetch parameters are rejected."""
+        with pytest.raises(ValueError):
+            FetchRequest(**kwargs)
+
+
+_MIXED_ITEMS = (
+    {"id": 1, "title": "Python Tutorial", "score": 50, "by": "user1", "time": 1640995200},
+    {"id": 2, "title": "Python Guide", "score": 100, "by": "user2", "time": 1640995300},
+    {"id": 3, "title": "JavaScript Tutorial", "score": 100, "by": "user3", "time": 1640995400},
+    {"id": 4, "title": "Python Best Practices", "score": 150, "by": "user4", "time": 1640995500},
+)
+
+_MISSING_FIELD_ITEMS = (
+    {"id": 1, "title": "Python Story", "score": 100},
+    {"id": 2, "score": 100},  # Missing title
+    {"id": 3, "title": "Python Guide"},  # Missing score
+)
+
+_MIXED_CASE_ITEMS = (
+    {"id": 1, "title": "Python Tutorial", "score": 100},
+    {"id": 2, "title": "PYTHON Guide", "score": 100},
+    {"id": 3, "title": "python best practices", "score": 100},
+)
+
+# (items, filter kwargs, expected ids in order)
+FILTER_CASES = [
+    pytest.param(_MIXED_ITEMS, {"min_score": 100, "keyword": "Python"}, [2, 4], id="score-and-keyword"),
+    pytest.param(_MIXED_ITEMS, {"min_score": 100}, [2, 3, 4], id="score-only"),
+    pytest.param(_MIXED_ITEMS, {"keyword": "Tutorial"}, [1, 3], id="keyword-only"),
+    pytest.param(_MIXED_ITEMS, {}, [1, 2, 3, 4], id="no-criteria"),
+    pytest.param(_MISSING_FIELD_ITEMS, {"min_score": 100, "keyword": "Python"}, [1], id="missing-fields"),
+    pytest.param(_MIXED_CASE_ITEMS, {"keyword": "python"}, [1, 2, 3], id="case-insensitive"),
+    pytest.param((), {}, [], id="empty-input"),
+    pytest.param((), {"min_score": 100, "keyword": "python"}, [], id="empty-input-with-criteria"),
+]
 
 
 class TestHackerNewsClientBusinessLogic:
     """Test business logic in HackerNewsAPIClient."""
     
-    def test_transform_item_fields(self):
+    @pytest.fixture(scope="class")
+    def client(self):
+        """HackerNewsAPIClient is stateless for filtering, so one instance serves the class."""
+        return HackerNewsAPIClient()
+    
+    def test_transform_item_fields(self, client):
         """Test custom field transformation logic."""
-        client = HackerNewsAPIClient()
-        
         # Test "by" -> "author" transformation
         item = {"id": 1, "by": "testuser", "time": 1640995200}
         transformed = client.transform_item_fields(item)
@@ -66,68 +110,28 @@ class TestHackerNewsClientBusinessLogic:
         assert "time" not in transformed
         assert transformed["timestamp"] == 1640995200
     
-    def test_filter_items_complex_logic(self):
-        """Test complex filtering logic with multiple criteria."""
-        client = HackerNewsAPIClient()
-        
-        items = [
-            {"id": 1, "title": "Python Tutorial", "score": 50, "by": "user1", "time": 1640995200},
-            {"id": 2, "title": "Python Guide", "score": 100, "by": "user2", "time": 1640995300},
-            {"id": 3, "title": "JavaScript Tutorial", "score": 100, "by": "user3", "time": 1640995400},
-            {"id": 4, "title": "Python Best Practices", "score": 150, "by": "user4", "time": 1640995500},
-        ]
+    @pytest.mark.parametrize("items, kwargs, expected_ids", FILTER_CASES)
+    def test_filter_items(self, client, items, kwargs, expected_ids):
+        """Test filtering by score and/or keyword across input shapes."""
+        filtered = client.filter_items(list(items), **kwargs)
         
-        # Test filtering by both score and keyword
-        filtered = client.filter_items(items, min_score=100, keyword="Python")
-        
-        assert len(filtered) == 2
-        assert filtered[0]["id"] == 2
-        assert filtered[1]["id"] == 4
+        assert [item["id"] for item in filtered] == expected_ids
+    
+    def test_filter_items_transforms_matches(self, client):
+        """Test filtered items come back with API fields transformed."""
+        filtered = client.filter_items(list(_MIXED_ITEMS), min_score=100, keyword="Python")
         
-        # Verify field transformation happened
         assert "author" in filtered[0]
         assert "timestamp" in filtered[0]
         assert "by" not in filtered[0]
         assert "time" not in filtered[0]
     
-    def test_filter_items_edge_cases(self):
-        """Test filtering logic edge cases."""
-        client = HackerNewsAPIClient()
-        
-        # Test with missing fields
-        items = [
-            {"id": 1, "title": "Python Story", "score": 100},
-            {"id": 2, "score": 100},  # Missing title
-            {"id": 3, "title": "Python Guide"},  # Missing score
-        ]
-        
-        # Should handle missing fields gracefully
-        filtered = client.filter_items(items, min_score=100, keyword="Python")
-        assert len(filtered) == 1
-        assert filtered[0]["id"] == 1
-    
-    def test_filter_items_case_insensitive(self):
-        """Test case-insensitive keyword filtering."""
-        client = HackerNewsAPIClient()
-        
-        items = [
-            {"id": 1, "title": "Python Tutorial", "score": 100},
-            {"id": 2, "title": "PYTHON Guide", "score": 100},
-            {"id": 3, "title": "python best practices", "score": 100},
-        ]
-        
-        filtered = client.filter_items(items, keyword="python")
-        assert len(filtered) == 3
-    
-    def test_filter_items_empty_input(self):
-        """Test filtering with empty input."""
-        client = HackerNewsAPIClient()
-        
-        filtered = client.filter_items([])
-        assert filtered == []
+    def test_filter_items_no_criteria_returns_input(self, client):
+        """Test filtering without criteria returns the input list without copying."""
+        items = [{"id": 1, "title": "Python Tutorial", "score": 100}]
         
-        filtered = client.filter_items([], min_score=100, keyword="python")
-        assert filtered == []
+        assert client.filter_items(items) is items
+        assert client.filter_items(items, keyword="   ") is items
 
 
 class TestDomainLogicIntegration:
@@ -1,5 +1,34 @@
 import pytest
+from sqlalchemy import asc, desc, event, func, select, text
+from sqlalchemy.orm import raiseload
 from app.models.orm import HackerNewsItem
+from app.services.data_service import _ITEM_RESPONSE_FIELDS, _ORDERING, data_service
+
+
+# (criteria, ordering, expected ids) against STANDARD_SEED in conftest
+QUERY_CASES = [
+    pytest.param((HackerNewsItem.score >= 100,), (HackerNewsItem.id,), [2, 3, 4], id="by_score"),
+    pytest.param((HackerNewsItem.title.ilike("%Python%"),), (HackerNewsItem.id,), [1, 3, 4], id="by_keyword"),
+    pytest.param((), (desc(HackerNewsItem.score),), [2, 3, 4, 1], id="ordered_by_score_desc"),
+    pytest.param((), (asc(HackerNewsItem.timestamp),), [1, 3, 2, 4], id="ordered_by_timestamp_asc"),
+    pytest.param(
+        (HackerNewsItem.score >= 100, HackerNewsItem.title.ilike("%Python%")),
+        (desc(HackerNewsItem.score),),
+        [3, 4],
+        id="multiple_filters",
+    ),
+]
+
+# Composite index expected to serve each order_by field of DataService._ORDERING
+_ORDER_INDEXES = {
+    "score": "ix_hacker_news_items_score_id",
+    "time": "ix_hacker_news_items_timestamp_id",
+}
+
+COUNT_CASES = [
+    pytest.param((), 4, id="all"),
+    pytest.param((HackerNewsItem.score >= 150,), 2, id="score_at_least_150"),
+]
 
 
 class TestHackerNewsItemRepository:
@@ -21,7 +50,6 @@ class TestHackerNewsItemRepository:
         
         db_session.add(item)
         db_session.commit()
-        db_session.refresh(item)
         
         # Verify item was created
         assert item.id == 12345
@@ -44,9 +72,8 @@ class TestHackerNewsItemRepository:
             HackerNewsItem(id=3, title="Story 3", score=150, author="user3", timestamp=1640995400, type="story"),
         ]
         
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
+        with db_session.begin():
+            db_session.add_all(items)
         
         # Verify all items were created
         stored_items = db_session.query(HackerNewsItem).all()
@@ -102,7 +129,6 @@ class TestHackerNewsItemRepository:
         item.score = 150
         item.author = "updateduser"
         db_session.commit()
-        db_session.refresh(item)
         
         # Verify updates
         assert item.title == "Updated Title"
@@ -133,170 +159,67 @@ class TestHackerNewsItemRepository:
         # Verify item was deleted
         assert db_session.query(HackerNewsItem).filter_by(id=12345).first() is None
     
-    def test_query_items_by_score(self, db_session):
-        """Test querying items by score filter."""
-        # Create test items with different scores
-        items = [
-            HackerNewsItem(id=1, title="Low Score", score=50, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="Medium Score", score=100, author="user2", timestamp=1640995300, type="story"),
-            HackerNewsItem(id=3, title="High Score", score=200, author="user3", timestamp=1640995400, type="story"),
-        ]
-        
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
-        
-        # Query items with score >= 100
-        high_score_items = db_session.query(HackerNewsItem).filter(HackerNewsItem.score >= 100).all()
-        
-        assert len(high_score_items) == 2
-        assert high_score_items[0].id == 2
-        assert high_score_items[1].id == 3
-    
-    def test_query_items_by_keyword(self, db_session):
-        """Test querying items by keyword in title."""
-        # Create test items with different titles
-        items = [
-            HackerNewsItem(id=1, title="Python Tutorial", score=100, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="JavaScript Guide", score=100, author="user2", timestamp=1640995300, type="story"),
-            HackerNewsItem(id=3, title="Python Best Practices", score=100, author="user3", timestamp=1640995400, type="story"),
-        ]
-        
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
-        
-        # Query items with "Python" in title
-        python_items = db_session.query(HackerNewsItem).filter(
-            HackerNewsItem.title.ilike("%Python%")
+    def test_query_items_by_keyword_fts5_matches_ilike(self, db_session, seed_items):
+        """Test that an FTS5 index over titles returns the same rows as the ILIKE scan."""
+        seed_items([
+            {"id": 1, "title": "Python Tutorial", "score": 100, "author": "user1", "timestamp": 1640995200, "type": "story"},
+            {"id": 2, "title": "JavaScript Guide", "score": 100, "author": "user2", "timestamp": 1640995300, "type": "story"},
+            {"id": 3, "title": "Python Best Practices", "score": 100, "author": "user3", "timestamp": 1640995400, "type": "story"},
+        ])
+
+        # External-content FTS5 table backed by hacker_news_items; rolled back with the test
+        db_session.execute(text(
+            "CREATE VIRTUAL TABLE items_fts USING fts5(title, content='hacker_news_items', content_rowid='id')"
+        ))
+        db_session.execute(text("INSERT INTO items_fts(items_fts) VALUES ('rebuild')"))
+
+        fts_ids = db_session.execute(
+            text("SELECT rowid FROM items_fts WHERE items_fts MATCH :term ORDER BY rowid"),
+            {"term": "Python"},
+        ).scalars().all()
+        ilike_ids = db_session.scalars(
+            select(HackerNewsItem.id).where(HackerNewsItem.title.ilike("%Python%")).order_by(HackerNewsItem.id)
         ).all()
-        
-        assert len(python_items) == 2
-        assert python_items[0].id == 1
-        assert python_items[1].id == 3
-    
-    def test_query_items_ordered_by_score_desc(self, db_session):
-        """Test querying items ordered by score descending."""
-        # Create test items with different scores
-        items = [
-            HackerNewsItem(id=1, title="Low Score", score=50, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="Medium Score", score=100, author="user2", timestamp=1640995300, type="story"),
-            HackerNewsItem(id=3, title="High Score", score=200, author="user3", timestamp=1640995400, type="story"),
-        ]
-        
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
-        
-        # Query items ordered by score descending
-        from sqlalchemy import desc
-        ordered_items = db_session.query(HackerNewsItem).order_by(desc(HackerNewsItem.score)).all()
-        
-        assert len(ordered_items) == 3
-        assert ordered_items[0].score == 200
-        assert ordered_items[1].score == 100
-        assert ordered_items[2].score == 50
-    
-    def test_query_items_ordered_by_timestamp_asc(self, db_session):
-        """Test querying items ordered by timestamp ascending."""
-        # Create test items with different timestamps
-        items = [
-            HackerNewsItem(id=1, title="Old Story", score=100, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="New Story", score=100, author="user2", timestamp=1640995400, type="story"),
-            HackerNewsItem(id=3, title="Middle Story", score=100, author="user3", timestamp=1640995300, type="story"),
-        ]
-        
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
-        
-        # Query items ordered by timestamp ascending
-        from sqlalchemy import asc
-        ordered_items = db_session.query(HackerNewsItem).order_by(asc(HackerNewsItem.timestamp)).all()
-        
-        assert len(ordered_items) == 3
-        assert ordered_items[0].timestamp == 1640995200
-        assert ordered_items[1].timestamp == 1640995300
-        assert ordered_items[2].timestamp == 1640995400
-    
-    def test_query_items_with_multiple_filters(self, db_session):
-        """Test querying items with multiple filters."""
-        # Create test items
-        items = [
-            HackerNewsItem(id=1, title="Python Low Score", score=50, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="Python High Score", score=150, author="user2", timestamp=1640995300, type="story"),
-            HackerNewsItem(id=3, title="JavaScript High Score", score=150, author="user3", timestamp=1640995400, type="story"),
-            HackerNewsItem(id=4, title="Python Medium Score", score=100, author="user4", timestamp=1640995500, type="story"),
-        ]
-        
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
-        
-        # Query items with score >= 100 AND title contains "Python"
-        from sqlalchemy import desc
-        filtered_items = db_session.query(HackerNewsItem).filter(
-            HackerNewsItem.score >= 100,
-            HackerNewsItem.title.ilike("%Python%")
-        ).order_by(desc(HackerNewsItem.score)).all()
-        
-        assert len(filtered_items) == 2
-        assert filtered_items[0].id == 2  # Python High Score (150)
-        assert filtered_items[1].id == 4  # Python Medium Score (100)
-    
-    def test_count_items(self, db_session):
-        """Test counting items in the database."""
-        # Create test items
-        items = [
-            HackerNewsItem(id=1, title="Story 1", score=100, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="Story 2", score=200, author="user2", timestamp=1640995300, type="story"),
-            HackerNewsItem(id=3, title="Story 3", score=150, author="user3", timestamp=1640995400, type="story"),
-        ]
-        
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
-        
-        # Count all items
-        total_count = db_session.query(HackerNewsItem).count()
-        assert total_count == 3
-        
-        # Count items with score >= 150
-        high_score_count = db_session.query(HackerNewsItem).filter(HackerNewsItem.score >= 150).count()
-        assert high_score_count == 2
-    
-    def test_pagination(self, db_session):
+
+        assert fts_ids == ilike_ids == [1, 3]
+
+    @pytest.mark.parametrize("order_by,order_direction", sorted(_ORDERING))
+    def test_ordered_query_uses_index(self, db_session, order_by, order_direction):
+        """Test every listing order the service builds is served by an index scan rather than a sort."""
+        query = data_service.get_items_query(db_session, order_by=order_by, order_direction=order_direction)
+        page_query = query.offset(0).limit(10)
+        sql = page_query.compile(dialect=db_session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        plan = db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        details = " | ".join(row[-1] for row in plan)
+
+        # id ordering walks the table itself (the rowid); the others need their composite index
+        if order_by in _ORDER_INDEXES:
+            assert f"USING INDEX {_ORDER_INDEXES[order_by]}" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_pagination(self, db_session, seed_items):
         """Test pagination of query results."""
         # Create test items
-        items = []
-        for i in range(10):
-            item = HackerNewsItem(
-                id=i+1,
-                title=f"Story {i+1}",
-                score=100 + i,
-                author=f"user{i+1}",
-                timestamp=1640995200 + i,
-                type="story"
-            )
-            items.append(item)
-        
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
+        seed_items([
+            {
+                "id": i + 1,
+                "title": f"Story {i + 1}",
+                "score": 100 + i,
+                "author": f"user{i + 1}",
+                "timestamp": 1640995200 + i,
+                "type": "story",
+            }
+            for i in range(10)
+        ])
+        
+        # Only ids are asserted, so select the id column instead of full entities
+        page_query = select(HackerNewsItem.id).order_by(HackerNewsItem.id).limit(3)
         
         # Test pagination: page 1, size 3
-        page1_items = db_session.query(HackerNewsItem).order_by(HackerNewsItem.id).limit(3).offset(0).all()
-        assert len(page1_items) == 3
-        assert page1_items[0].id == 1
-        assert page1_items[1].id == 2
-        assert page1_items[2].id == 3
+        assert db_session.scalars(page_query.offset(0)).all() == [1, 2, 3]
         
         # Test pagination: page 2, size 3
-        page2_items = db_session.query(HackerNewsItem).order_by(HackerNewsItem.id).limit(3).offset(3).all()
-        assert len(page2_items) == 3
-        assert page2_items[0].id == 4
-        assert page2_items[1].id == 5
-        assert page2_items[2].id == 6
+        assert db_session.scalars(page_query.offset(3)).all() == [4, 5, 6]
     
     def test_unique_constraint_violation(self, db_session):
         """Test that duplicate IDs are not allowed."""
@@ -347,7 +270,6 @@ class TestHackerNewsItemRepository:
         
         db_session.add(item)
         db_session.commit()
-        db_session.refresh(item)
         
         # Verify item was created with None values
         assert item.id == 12345
@@ -359,3 +281,45 @@ class TestHackerNewsItemRepository:
         assert item.url is None
         assert item.descendants is None
         assert item.text is None
+
+
+class TestHackerNewsItemQueries:
+    """Read-only query tests sharing one seeded session per class."""
+
+    @pytest.mark.parametrize("criteria,ordering,expected_ids", QUERY_CASES)
+    def test_query_items(self, seeded_session, criteria, ordering, expected_ids):
+        """Test filtering and ordering items."""
+        ids = seeded_session.scalars(select(HackerNewsItem.id).where(*criteria).order_by(*ordering)).all()
+        assert ids == expected_ids
+
+    @pytest.mark.parametrize("criteria,expected_count", COUNT_CASES)
+    def test_count_items(self, seeded_session, criteria, expected_count):
+        """Test counting items in the database."""
+        count = seeded_session.scalar(select(func.count()).select_from(HackerNewsItem).where(*criteria))
+        assert count == expected_count
+
+    def test_listing_attributes_need_no_lazy_loads(self, seeded_session):
+        """Test serializing a listed page, and every mapped attribute, issues no further queries."""
+        # raiseload("*") turns any lazy relationship load into an error instead of an N+1 query;
+        # the statement listener also catches lazily loaded (e.g. deferred) columns
+        query = data_service.get_items_query(seeded_session, order_by="id", order_direction="asc")
+        items = seeded_session.scalars(query.options(raiseload("*"))).all()
+
+        statements = []
+        connection = seeded_session.connection()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(connection, "before_cursor_execute", record)
+        try:
+            # Same field access as the page serializer in DataService._iter_page_json
+            rows = [{field: getattr(item, field, None) for field in _ITEM_RESPONSE_FIELDS} for item in items]
+            for item in items:
+                for attr in HackerNewsItem.__mapper__.attrs:
+                    getattr(item, attr.key)
+        finally:
+            event.remove(connection, "before_cursor_execute", record)
+
+        assert [row["id"] for row in rows] == [1, 2, 3, 4]
+        assert statements == []
@@ -1,9 +1,44 @@
+import asyncio
+import time
 import pytest
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock, AsyncMock
-from app.services.data_service import DataService
+from uuid import uuid4
+import redis.asyncio as aioredis
+from fastapi_limiter.depends import RateLimiter
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
 from app.services.hacker_news_client import HackerNewsAPIClient
 from app.models.orm import HackerNewsItem
-from app.models.api import StoreItemsResponse
+from app.models.api import HackerNewsItemPage, StoreItemsResponse
+from app.core.config import settings, redis_health_check
+from app.core.config.rate_limit import TOKEN_BUCKET_LUA_SCRIPT, TOKEN_BUCKET_PREFIX, init_rate_limiter
+
+
+# Every stored column for item 1; tests spread it and override only what they exercise
+_BASE_ITEM = MappingProxyType({
+    "id": 1,
+    "title": "Test Title",
+    "url": "https://example.com",
+    "score": 100,
+    "author": "testuser",
+    "timestamp": 1640995200,
+    "descendants": 10,
+    "type": "story",
+    "text": None,
+})
+
+
+def _async_return(outcome):
+    """Plain coroutine function that raises outcome if it is an exception, else returns it.
+
+    Cheaper than AsyncMock for stubs whose calls are never asserted.
+    """
+    async def _coro(*args, **kwargs):
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return _coro
 
 
 class TestDataService:
@@ -26,44 +61,29 @@ class TestDataService:
         assert stored_items[1].title == "Test Story 2"
         
         # Verify return value
-        assert isinstance(result, StoreItemsResponse)
-        assert result.stored_count == 2
-        assert result.new_items == 2
-        assert result.updated_items == 0
+        assert result == StoreItemsResponse(
+            stored_count=2, total_items=2, new_items=2, updated_items=0, skipped_items=0
+        )
     
     def test_store_items_existing_items_update(self, fake_data_service, db_session):
         """Test storing items that already exist (should update)."""
         service = fake_data_service
         
         # Create existing item
-        existing_item = HackerNewsItem(
-            id=1,
-            title="Old Title",
-            url="https://old.com",
-            score=50,
-            author="olduser",
-            timestamp=1640995000,
-            descendants=5,
-            type="story",
-            text=None
-        )
+        existing_item = HackerNewsItem(**{
+            **_BASE_ITEM,
+            "title": "Old Title",
+            "url": "https://old.com",
+            "score": 50,
+            "author": "olduser",
+            "timestamp": 1640995000,
+            "descendants": 5,
+        })
         db_session.add(existing_item)
         db_session.commit()
         
         # New data for the same item (using API field names to test mapping)
-        items = [
-            {
-                "id": 1,
-                "title": "New Title",
-                "url": "https://new.com",
-                "score": 100,
-                "author": "newuser",
-                "timestamp": 1640995200,
-                "descendants": 10,
-                "type": "story",
-                "text": None
-            }
-        ]
+        items = [{**_BASE_ITEM, "title": "New Title", "url": "https://new.com", "author": "newuser"}]
         
         result = service.store_items(items, db_session)
         
@@ -75,57 +95,74 @@ class TestDataService:
         assert updated_item.author == "newuser"
         
         # Verify return value
-        assert isinstance(result, StoreItemsResponse)
-        assert result.stored_count == 1
-        assert result.new_items == 0
-        assert result.updated_items == 1
+        assert result == StoreItemsResponse(
+            stored_count=1, total_items=1, new_items=0, updated_items=1, skipped_items=0
+        )
     
     def test_store_items_existing_items_no_changes(self, fake_data_service, db_session):
         """Test storing items that exist but haven't changed."""
         service = fake_data_service
         
         # Create existing item
-        existing_item = HackerNewsItem(
-            id=1,
-            title="Test Title",
-            url="https://example.com",
-            score=100,
-            author="testuser",
-            timestamp=1640995200,
-            descendants=10,
-            type="story",
-            text=None
-        )
+        existing_item = HackerNewsItem(**_BASE_ITEM)
         db_session.add(existing_item)
         db_session.commit()
         
         # Same data
-        items = [
-            {
-                "id": 1,
-                "title": "Test Title",
-                "url": "https://example.com",
-                "score": 100,
-                "author": "testuser",
-                "timestamp": 1640995200,
-                "descendants": 10,
-                "type": "story",
-                "text": None
-            }
-        ]
+        items = [dict(_BASE_ITEM)]
         
+        # total_changes() counts rows written on this connection, so the upsert's
+        # WHERE guard must leave it untouched
+        changes_before = db_session.scalar(text("SELECT total_changes()"))
         result = service.store_items(items, db_session)
+        changes_after = db_session.scalar(text("SELECT total_changes()"))
         
         # Verify item wasn't changed
+        assert changes_after == changes_before
         item = db_session.query(HackerNewsItem).filter_by(id=1).first()
         assert item.title == "Test Title"
         
         # Verify return value
-        assert isinstance(result, StoreItemsResponse)
-        assert result.stored_count == 0
-        assert result.new_items == 0
-        assert result.updated_items == 0
+        assert result == StoreItemsResponse(
+            stored_count=0, total_items=1, new_items=0, updated_items=0, skipped_items=1
+        )
     
+    def test_store_items_single_write_statement(self, fake_data_service, db_session):
+        """Test a mixed batch is stored with one SELECT and one upsert."""
+        service = fake_data_service
+
+        db_session.add_all([
+            HackerNewsItem(**{**_BASE_ITEM, "id": 1}),
+            HackerNewsItem(**{**_BASE_ITEM, "id": 2}),
+        ])
+        db_session.commit()
+
+        # Item 1 unchanged, item 2 changed, item 3 new
+        items = [
+            {**_BASE_ITEM, "id": 1},
+            {**_BASE_ITEM, "id": 2, "score": 250},
+            {**_BASE_ITEM, "id": 3},
+        ]
+
+        statements = []
+        connection = db_session.connection()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split(None, 1)[0].upper())
+
+        event.listen(connection, "before_cursor_execute", record)
+        try:
+            result = service.store_items(items, db_session)
+        finally:
+            event.remove(connection, "before_cursor_execute", record)
+
+        data_statements = [s for s in statements if s in ("SELECT", "INSERT", "UPDATE")]
+        assert data_statements == ["SELECT", "INSERT"]
+        assert result == StoreItemsResponse(
+            stored_count=2, total_items=3, new_items=1, updated_items=1, skipped_items=1
+        )
+        assert db_session.get(HackerNewsItem, 2).score == 250
+
     def test_store_items_empty_list(self, fake_data_service, db_session):
         """Test storing empty list of items."""
         service = fake_data_service
@@ -137,25 +174,43 @@ class TestDataService:
         assert len(stored_items) == 0
         
         # Verify return value
-        assert isinstance(result, StoreItemsResponse)
-        assert result.stored_count == 0
-        assert result.new_items == 0
-        assert result.updated_items == 0
+        assert result == StoreItemsResponse(
+            stored_count=0, total_items=0, new_items=0, updated_items=0, skipped_items=0
+        )
     
+    @pytest.mark.slow
+    def test_store_items_throughput_close_to_raw_executemany(self, fake_data_service, db_session):
+        """Test storing 10k items stays within 5x of a raw sqlite3 executemany."""
+        service = fake_data_service
+        items = [{**_BASE_ITEM, "id": i, "title": f"Story {i}"} for i in range(1, 10_001)]
+        columns = ("id", "title", "url", "score", "author", "timestamp", "descendants", "type", "text")
+        raw_rows = [tuple(item[column] for column in columns) for item in items]
+
+        # Raw baseline on the same connection, inside a SAVEPOINT that is rolled back afterwards
+        savepoint = db_session.begin_nested()
+        cursor = db_session.connection().connection.driver_connection.cursor()
+        start = time.perf_counter()
+        cursor.executemany(
+            "INSERT INTO hacker_news_items (id, title, url, score, author, timestamp, descendants, type, text, "
+            "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+            raw_rows,
+        )
+        raw_elapsed = time.perf_counter() - start
+        cursor.close()
+        savepoint.rollback()
+
+        start = time.perf_counter()
+        result = service.store_items(items, db_session)
+        store_elapsed = time.perf_counter() - start
+
+        assert result.new_items == len(items)
+        assert store_elapsed < 5 * raw_elapsed, f"store_items {store_elapsed:.3f}s vs raw {raw_elapsed:.3f}s"
+
     def test_store_items_database_error(self, fake_data_service, db_session):
         """Test handling database errors during storage."""
         service = fake_data_service
         
-        items = [
-            {
-                "id": 1,
-                "title": "Test Story",
-                "score": 100,
-                "author": "testuser",
-                "timestamp": 1640995200,
-                "type": "story"
-            }
-        ]
+        items = [dict(_BASE_ITEM)]
         
         # Mock the database session to raise an exception
         with patch.object(db_session, 'commit') as mock_commit:
@@ -164,40 +219,33 @@ class TestDataService:
             with pytest.raises(Exception, match="Database error"):
                 service.store_items(items, db_session)
     
-    def test_get_items_query_basic(self, fake_data_service, db_session):
+    def test_get_items_query_basic(self, fake_data_service, db_session, seed_items):
         """Test building basic query without filters."""
         service = fake_data_service
         
         # Add some test data
-        items = [
-            HackerNewsItem(id=1, title="Story 1", score=100, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="Story 2", score=200, author="user2", timestamp=1640995300, type="story"),
-        ]
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
+        seed_items([
+            {"id": 1, "title": "Story 1", "score": 100, "author": "user1", "timestamp": 1640995200, "type": "story"},
+            {"id": 2, "title": "Story 2", "score": 200, "author": "user2", "timestamp": 1640995300, "type": "story"},
+        ])
         
-        # Use the db_session directly
-        query = service.get_items_query(db_session)
-        results = query.all()
+        # Use the db_session directly, projecting only the columns under test
+        query = service.get_items_query(db_session, columns=(HackerNewsItem.id, HackerNewsItem.score))
+        results = db_session.execute(query).all()
         
-        assert len(results) == 2
-        assert results[0].id == 2  # Default order by score desc
-        assert results[1].id == 1
+        # Default order by score desc
+        assert [(row.id, row.score) for row in results] == [(2, 200), (1, 100)]
     
-    def test_get_items_query_with_filters(self, fake_data_service, db_session):
+    def test_get_items_query_with_filters(self, fake_data_service, db_session, seed_items):
         """Test building query with filters."""
         service = fake_data_service
         
         # Add test data
-        items = [
-            HackerNewsItem(id=1, title="Python Story", score=50, author="user1", timestamp=1640995200, type="story"),
-            HackerNewsItem(id=2, title="JavaScript Story", score=100, author="user2", timestamp=1640995300, type="story"),
-            HackerNewsItem(id=3, title="Python Guide", score=150, author="user3", timestamp=1640995400, type="story"),
-        ]
-        for item in items:
-            db_session.add(item)
-        db_session.commit()
+        seed_items([
+            {"id": 1, "title": "Python Story", "score": 50, "author": "user1", "timestamp": 1640995200, "type": "story"},
+            {"id": 2, "title": "JavaScript Story", "score": 100, "author": "user2", "timestamp": 1640995300, "type": "story"},
+            {"id": 3, "title": "Python Guide", "score": 150, "author": "user3", "timestamp": 1640995400, "type": "story"},
+        ])
         
         # Use the db_session directly
         query = service.get_items_query(
@@ -207,29 +255,84 @@ class TestDataService:
             order_by="score",
             order_direction="desc"
         )
-        results = query.all()
+        results = db_session.scalars(query).all()
         
         assert len(results) == 1
         assert results[0].id == 3  # Only Python Guide with score >= 100
         assert results[0].title == "Python Guide"
     
-    def test_get_items_query_by_id(self, fake_data_service, db_session):
+    def test_get_items_query_by_id(self, fake_data_service, db_session, seed_items):
         """Test building query to get specific item by ID."""
         service = fake_data_service
         
         # Add test data
-        item = HackerNewsItem(id=123, title="Specific Story", score=100, author="user1", timestamp=1640995200, type="story")
-        db_session.add(item)
-        db_session.commit()
+        seed_items([{"id": 123, "title": "Specific Story", "score": 100, "author": "user1", "timestamp": 1640995200, "type": "story"}])
         
         # Use the db_session directly
         query = service.get_items_query(db_session, item_id=123)
-        results = query.all()
+        results = db_session.scalars(query).all()
         
         assert len(results) == 1
         assert results[0].id == 123
         assert results[0].title == "Specific Story"
 
+    @pytest.mark.parametrize("page,with_total,expected_ids,expected_total,expected_pages", [
+        pytest.param(1, False, [3, 2], 3, 2, id="first_page"),
+        pytest.param(2, False, [1], None, None, id="later_page"),
+        pytest.param(2, True, [1], 3, 2, id="later_page_with_total"),
+    ])
+    def test_stream_page_matches_page_schema(
+        self, fake_data_service, db_session, seed_items, page, with_total, expected_ids, expected_total, expected_pages
+    ):
+        """Test the streamed page validates against the endpoint's response model."""
+        seed_items([
+            {"id": i, "title": f"Story {i}", "score": 100 * i, "author": f"user{i}", "timestamp": 1640995200 + i, "type": "story"}
+            for i in (1, 2, 3)
+        ])
+        query = fake_data_service.get_items_query(db_session)
+        
+        body = b"".join(fake_data_service.stream_page(db_session, query, page, 2, with_total))
+        result = HackerNewsItemPage.model_validate_json(body)
+        
+        assert [item.id for item in result.items] == expected_ids
+        assert (result.total, result.page, result.size, result.pages) == (expected_total, page, 2, expected_pages)
+
+    def test_stream_page_row_with_null_columns_matches_schema(self, fake_data_service, db_session, seed_items):
+        """Test a stored row with every nullable column empty still fits the response model."""
+        seed_items([{"id": 1, "title": "Bare Story"}])
+        query = fake_data_service.get_items_query(db_session)
+        
+        body = b"".join(fake_data_service.stream_page(db_session, query, 1, 10))
+        result = HackerNewsItemPage.model_validate_json(body)
+        
+        assert result.items[0].model_dump(exclude={"id", "title"}) == dict.fromkeys(
+            ("url", "score", "author", "timestamp", "descendants", "kids", "type", "text")
+        )
+
+    @pytest.mark.parametrize("page,with_total", [
+        pytest.param(1, False, id="counted_page"),
+        pytest.param(2, False, id="uncounted_page"),
+    ])
+    def test_stream_page_query_errors_raise_before_streaming(self, fake_data_service, db_session, page, with_total):
+        """Test a failing page query raises from stream_page itself, before any bytes are produced."""
+        query = fake_data_service.get_items_query(db_session).where(text("no_such_column = 1"))
+        
+        with pytest.raises(OperationalError):
+            fake_data_service.stream_page(db_session, query, page, 10, with_total)
+
+    def test_stream_page_leaves_session_to_caller(self, fake_data_service, db_session, seed_items):
+        """Test streaming a page never touches or closes the caller's session once it is returned."""
+        seed_items([{"id": 1, "title": "Story 1"}, {"id": 2, "title": "Story 2"}])
+        query = fake_data_service.get_items_query(db_session, order_by="id", order_direction="asc")
+        
+        stream = fake_data_service.stream_page(db_session, query, 2, 1)
+        with patch.object(db_session, "close") as mock_close, patch.object(db_session, "execute") as mock_execute:
+            body = b"".join(stream)
+        
+        assert [item.id for item in HackerNewsItemPage.model_validate_json(body).items] == [2]
+        mock_close.assert_not_called()
+        mock_execute.assert_not_called()
+
 
 class TestHackerNewsAPIClient:
     """Test HackerNewsAPIClient with mocked external API calls."""
@@ -239,33 +342,25 @@ class TestHackerNewsAPIClient:
         """Test successful API call to get top stories."""
         client = HackerNewsAPIClient()
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = MagicMock()
-            mock_response.json.return_value = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-            mock_response.raise_for_status.return_value = None
-            
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.get.return_value = mock_response
-            mock_client.return_value = mock_client_instance
+        mock_response = MagicMock()
+        mock_response.json.return_value = list(range(1, 11))
+        mock_response.raise_for_status.return_value = None
+        
+        with patch.object(client, "_client") as mock_http:
+            mock_http.get = AsyncMock(return_value=mock_response)
             
             result = await client.get_top_stories(limit=5)
         
         assert result == [1, 2, 3, 4, 5]
-        mock_client_instance.get.assert_called_once_with(f"{client.base_url}/topstories.json")
+        mock_http.get.assert_called_once_with(f"{client.base_url}/topstories.json")
     
     @pytest.mark.asyncio
     async def test_get_top_stories_api_error(self):
         """Test handling API errors when getting top stories."""
         client = HackerNewsAPIClient()
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.get.side_effect = Exception("API Error")
-            mock_client.return_value = mock_client_instance
+        with patch.object(client, "_client") as mock_http:
+            mock_http.get = _async_return(Exception("API Error"))
             
             with pytest.raises(Exception, match="API Error"):
                 await client.get_top_stories()
@@ -287,37 +382,29 @@ class TestHackerNewsAPIClient:
             "text": None
         }
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = MagicMock()
-            mock_response.json.return_value = expected_item
-            mock_response.raise_for_status.return_value = None
-            
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.get.return_value = mock_response
-            mock_client.return_value = mock_client_instance
+        mock_response = MagicMock()
+        mock_response.json.return_value = expected_item
+        mock_response.raise_for_status.return_value = None
+        
+        with patch.object(client, "_client") as mock_http:
+            mock_http.get = AsyncMock(return_value=mock_response)
             
             result = await client.get_item(123)
         
         assert result == expected_item
-        mock_client_instance.get.assert_called_once_with(f"{client.base_url}/item/123.json")
+        mock_http.get.assert_called_once_with(f"{client.base_url}/item/123.json")
     
     @pytest.mark.asyncio
     async def test_get_item_not_found(self):
         """Test handling item not found."""
         client = HackerNewsAPIClient()
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = MagicMock()
-            mock_response.json.return_value = None
-            mock_response.raise_for_status.return_value = None
-            
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.get.return_value = mock_response
-            mock_client.return_value = mock_client_instance
+        mock_response = MagicMock()
+        mock_response.json.return_value = None
+        mock_response.raise_for_status.return_value = None
+        
+        with patch.object(client, "_client") as mock_http:
+            mock_http.get = _async_return(mock_response)
             
             result = await client.get_item(999)
         
@@ -328,12 +415,8 @@ class TestHackerNewsAPIClient:
         """Test handling API errors when getting item."""
         client = HackerNewsAPIClient()
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.get.side_effect = Exception("API Error")
-            mock_client.return_value = mock_client_instance
+        with patch.object(client, "_client") as mock_http:
+            mock_http.get = _async_return(Exception("API Error"))
             
             with pytest.raises(Exception, match="API Error"):
                 await client.get_item(123)
@@ -343,20 +426,13 @@ class TestHackerNewsAPIClient:
         """Test successful batch API calls."""
         client = HackerNewsAPIClient()
         
-        with patch.object(client, 'get_item') as mock_get_item:
-            async def mock_get_item_async(*args, **kwargs):
-                if args[0] == 1:
-                    return {"id": 1, "title": "Story 1"}
-                elif args[0] == 2:
-                    return {"id": 2, "title": "Story 2"}
-                elif args[0] == 3:
-                    return None
-                elif args[0] == 4:
-                    return {"id": 4, "title": "Story 4"}
-                return None
-            
-            mock_get_item.side_effect = mock_get_item_async
-            
+        # Item 3 (and any unknown id) comes back as None
+        responses = {1: {"id": 1, "title": "Story 1"}, 2: {"id": 2, "title": "Story 2"}, 4: {"id": 4, "title": "Story 4"}}
+        
+        async def mock_get_item_async(item_id, *args, **kwargs):
+            return responses.get(item_id)
+        
+        with patch.object(client, 'get_item', side_effect=mock_get_item_async):
             result = await client.get_items_batch([1, 2, 3, 4])
         
         assert len(result) == 3
@@ -369,20 +445,107 @@ class TestHackerNewsAPIClient:
         """Test batch API calls with some exceptions."""
         client = HackerNewsAPIClient()
         
-        with patch.object(client, 'get_item') as mock_get_item:
-            async def mock_get_item_async(*args, **kwargs):
-                if args[0] == 1:
-                    return {"id": 1, "title": "Story 1"}
-                elif args[0] == 2:
-                    raise Exception("API Error")
-                elif args[0] == 3:
-                    return {"id": 3, "title": "Story 3"}
-                return None
-            
-            mock_get_item.side_effect = mock_get_item_async
-            
+        responses = {1: {"id": 1, "title": "Story 1"}, 2: Exception("API Error"), 3: {"id": 3, "title": "Story 3"}}
+        
+        async def mock_get_item_async(item_id, *args, **kwargs):
+            response = responses.get(item_id)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        
+        with patch.object(client, 'get_item', side_effect=mock_get_item_async):
             result = await client.get_items_batch([1, 2, 3])
         
         assert len(result) == 2
         assert result[0]["id"] == 1
         assert result[1]["id"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_get_items_batch_fetches_concurrently_up_to_limit(self):
+        """Test batch item requests run concurrently, bounded by max_concurrent_requests."""
+        client = HackerNewsAPIClient()
+        concurrency_limit = 3
+        item_ids = list(range(1, 11))
+        in_flight = 0
+        max_in_flight = 0
+
+        async def mock_get_item_async(item_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"id": item_id, "title": f"Story {item_id}"}
+
+        with patch('app.services.hacker_news_client.settings.max_concurrent_requests', concurrency_limit), \
+                patch.object(client, 'get_item', side_effect=mock_get_item_async):
+            result = await client.get_items_batch(item_ids)
+
+        assert [item["id"] for item in result] == item_ids
+        assert max_in_flight == min(len(item_ids), concurrency_limit)
+
+    @pytest.mark.asyncio
+    async def test_http_client_reused_across_calls(self):
+        """Test item and batch requests share one long-lived pooled HTTP client."""
+        client = HackerNewsAPIClient()
+        
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"id": 1, "title": "Story"}
+        mock_response.raise_for_status.return_value = None
+        
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.aclose = AsyncMock()
+            
+            first = await client.get_items_batch([1, 2, 3])
+            second = await client.get_items_batch([4, 5])
+            await client.aclose()
+        
+        assert len(first) == 3
+        assert len(second) == 2
+        assert mock_client.call_count == 1
+        assert mock_client.return_value.get.call_count == 5
+        mock_client.return_value.aclose.assert_awaited_once()
+
+
+class TestTokenBucketRateLimiter:
+    """Test the token bucket script installed into fastapi-limiter."""
+
+    @pytest.mark.asyncio
+    async def test_init_rate_limiter_installs_token_bucket(self, fastapi_limiter_state):
+        """Test init loads the token bucket script and uses its own key prefix."""
+        connection = MagicMock()
+        connection.script_load = AsyncMock(return_value="token-bucket-sha")
+
+        await init_rate_limiter(connection)
+
+        connection.script_load.assert_awaited_once_with(TOKEN_BUCKET_LUA_SCRIPT)
+        assert fastapi_limiter_state.lua_script == TOKEN_BUCKET_LUA_SCRIPT
+        assert fastapi_limiter_state.lua_sha == "token-bucket-sha"
+        assert fastapi_limiter_state.prefix == TOKEN_BUCKET_PREFIX
+        assert fastapi_limiter_state.redis is connection
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_allows_capacity_then_waits_then_refills(self, fastapi_limiter_state):
+        """Test a bucket allows `times` requests, then asks for a positive wait, then refills over time."""
+        if not redis_health_check():
+            pytest.skip("requires a running Redis server")
+
+        connection = aioredis.from_url(settings.redis_url)
+        limiter = RateLimiter(times=3, milliseconds=300)
+        key = f"{TOKEN_BUCKET_PREFIX}:test:{uuid4()}"
+        try:
+            await init_rate_limiter(connection)
+
+            allowed = [await limiter._check(key) for _ in range(3)]
+            wait = await limiter._check(key)
+
+            assert allowed == [0, 0, 0]
+            # One token refills every 300 / 3 = 100 ms
+            assert 0 < wait <= 100
+
+            await asyncio.sleep(wait / 1000)
+            assert await limiter._check(key) == 0
+        finally:
+            await connection.delete(key)
+            await connection.aclose()
@@ -1,5 +1,8 @@
-from unittest.mock import patch, AsyncMock, MagicMock
+from operator import itemgetter
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import patch, MagicMock
 import pytest
+import app.tasks.fetch_tasks as ft
 from app.tasks.fetch_tasks import (
     fetch_top_stories,
     fetch_item_details,
@@ -7,366 +10,370 @@ from app.tasks.fetch_tasks import (
     fetch_and_process_pipeline,
     scheduled_fetch_task,
     update_task_status,
-    get_task_status
+    get_task_status,
+    enqueue_fetch_pipeline,
+    _fetch_top_stories_impl,
 )
 
 
+# Every task test runs against the eager, session-scoped Celery app; under xdist --dist=loadgroup
+# the whole file stays on one worker so the app is configured once
+pytestmark = [pytest.mark.usefixtures("celery_test_app"), pytest.mark.xdist_group("celery_tasks")]
+
+# Result fields checked together by the processing and scheduling tests
+_result_summary = itemgetter("items_processed", "items_filtered", "items_stored", "filters_applied")
+_pipeline_totals = itemgetter("total_stories_fetched", "total_items_processed")
+
+
+# Shared read-only test data; the code under test only reads these, so they are passed by reference
+_PROCESS_ITEMS = (
+    {"id": 1, "title": "Story 1", "score": 100, "author": "user1"},
+    {"id": 2, "title": "Story 2", "score": 200, "author": "user2"},
+)
+_PROCESS_FILTER_ITEMS = (
+    {"id": 1, "title": "Python Story", "score": 100, "author": "user1"},
+    {"id": 2, "title": "JavaScript Story", "score": 50, "author": "user2"},
+    {"id": 3, "title": "Python Guide", "score": 150, "author": "user3"},
+)
+_PIPELINE_ITEMS = (
+    {"id": 1, "title": "Story 1", "score": 100},
+    {"id": 2, "title": "Story 2", "score": 200},
+    {"id": 3, "title": "Story 3", "score": 150},
+)
+_PIPELINE_FILTER_ITEMS = (
+    {"id": 1, "title": "Python Story", "score": 100},
+    {"id": 2, "title": "JavaScript Story", "score": 50},
+    {"id": 3, "title": "Python Guide", "score": 150},
+    {"id": 4, "title": "Java Story", "score": 80},
+    {"id": 5, "title": "Python Tutorial", "score": 200},
+)
+
+# Canonical sub-task results; the pipeline and scheduler add keys to what they get back, so hand out dict() copies
+_PIPELINE_RESULT = MappingProxyType({
+    "items_processed": 3,
+    "items_filtered": 2,
+    "items_stored": 2,
+    "new_items": 2,
+    "updated_items": 0,
+    "filters_applied": {"min_score": 100, "keyword": None},
+})
+_PIPELINE_FILTER_RESULT = MappingProxyType({
+    "items_processed": 5,
+    "items_filtered": 3,
+    "items_stored": 3,
+    "new_items": 3,
+    "updated_items": 0,
+    "filters_applied": {"min_score": 100, "keyword": "Python"},
+})
+_SCHEDULED_RESULT = MappingProxyType({
+    "items_processed": 10,
+    "items_filtered": 8,
+    "items_stored": 8,
+    "new_items": 8,
+    "updated_items": 0,
+    "filters_applied": {"min_score": 50, "keyword": "AI"},
+})
+
+
+# (limit, client outcome); an Exception outcome is raised
+TOP_STORIES_CASES = [
+    pytest.param(5, [1, 2, 3, 4, 5], id="success"),
+    pytest.param(5, Exception("API Error"), id="api_error"),
+    pytest.param(5, [], id="empty_result"),
+]
+
+# (task kwargs, client outcome, limit passed to the client) for the Celery wrapper
+TOP_STORIES_TASK_CASES = [
+    pytest.param({}, list(range(1, 11)), 100, id="default_limit"),
+    pytest.param({"limit": 5}, Exception("API Error"), 5, id="api_error"),
+]
+
+# (item ids, client outcome); None entries are items that failed to fetch
+ITEM_DETAILS_CASES = [
+    pytest.param(
+        [1, 2],
+        [{"id": 1, "title": "Story 1", "score": 100}, {"id": 2, "title": "Story 2", "score": 200}],
+        id="success",
+    ),
+    pytest.param([], [], id="empty_list"),
+    pytest.param([1, 2], Exception("API Error"), id="api_error"),
+    pytest.param(
+        [1, 2, 3],
+        [{"id": 1, "title": "Story 1", "score": 100}, None, {"id": 3, "title": "Story 3", "score": 300}],
+        id="partial_failure",
+    ),
+]
+
+
+# (pipeline kwargs, sub-task outcomes, expected error message); Exception outcomes are raised
+PIPELINE_CASES = [
+    pytest.param(
+        {"min_score": 100, "keyword": None, "limit": 3},
+        {
+            "fetch_top_stories": [item["id"] for item in _PIPELINE_ITEMS],
+            "fetch_item_details": _PIPELINE_ITEMS,
+            "process_and_store_items": _PIPELINE_RESULT,
+        },
+        None,
+        id="success",
+    ),
+    pytest.param(
+        {"min_score": 100, "keyword": "Python", "limit": 5},
+        {
+            "fetch_top_stories": [item["id"] for item in _PIPELINE_FILTER_ITEMS],
+            "fetch_item_details": _PIPELINE_FILTER_ITEMS,
+            "process_and_store_items": _PIPELINE_FILTER_RESULT,
+        },
+        None,
+        id="with_filters",
+    ),
+    pytest.param({}, {"fetch_top_stories": Exception("Fetch error")}, "Fetch error", id="fetch_error"),
+    pytest.param(
+        {},
+        {"fetch_top_stories": [1, 2, 3], "fetch_item_details": Exception("Details error")},
+        "Details error",
+        id="details_error",
+    ),
+    pytest.param(
+        {},
+        {
+            "fetch_top_stories": [1, 2, 3],
+            "fetch_item_details": _PIPELINE_ITEMS[:1],
+            "process_and_store_items": Exception("Process error"),
+        },
+        "Process error",
+        id="process_error",
+    ),
+]
+
+
+class FakeHackerNewsClient:
+    """In-process stand-in for hacker_news_client that records calls and returns (or raises) one outcome."""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.calls = []
+
+    def _respond(self):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+    async def get_top_stories(self, limit: int = 100):
+        self.calls.append(limit)
+        return self._respond()
+
+    async def get_items_batch(self, item_ids):
+        self.calls.append(item_ids)
+        return self._respond()
+
+
 class TestFetchTopStoriesTask:
     """Test fetch_top_stories Celery task."""
 
-    def test_fetch_top_stories_success(self, celery_test_app):
-        """Test successful fetch_top_stories task execution."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.get_top_stories = AsyncMock(return_value=[1, 2, 3, 4, 5])
-            
-            # Execute the task
-            result = fetch_top_stories(limit=5)
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("limit,outcome", TOP_STORIES_CASES)
+    async def test_fetch_top_stories_impl(self, monkeypatch, limit, outcome):
+        """Test the async core returns the client's story IDs or propagates its error."""
+        fake_client = FakeHackerNewsClient(outcome)
+        monkeypatch.setattr(ft, "hacker_news_client", fake_client)
         
-        assert result == [1, 2, 3, 4, 5]
-        mock_client.get_top_stories.assert_called_once_with(limit=5)
-
-    def test_fetch_top_stories_with_default_limit(self, celery_test_app):
-        """Test fetch_top_stories with default limit."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.get_top_stories = AsyncMock(return_value=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
-            
-            result = fetch_top_stories()
+        if isinstance(outcome, Exception):
+            with pytest.raises(Exception, match=str(outcome)):
+                await _fetch_top_stories_impl(limit)
+        else:
+            assert await _fetch_top_stories_impl(limit) == outcome
         
-        assert result == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-        mock_client.get_top_stories.assert_called_once_with(limit=100)
+        assert fake_client.calls == [limit]
 
-    def test_fetch_top_stories_api_error(self, celery_test_app):
-        """Test fetch_top_stories when API call fails."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.get_top_stories = AsyncMock(side_effect=Exception("API Error"))
-            
-            with pytest.raises(Exception, match="API Error"):
-                fetch_top_stories(limit=5)
-
-    def test_fetch_top_stories_empty_result(self, celery_test_app):
-        """Test fetch_top_stories when API returns empty list."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.get_top_stories = AsyncMock(return_value=[])
-            
-            result = fetch_top_stories(limit=5)
+    @pytest.mark.parametrize("task_kwargs,outcome,expected_limit", TOP_STORIES_TASK_CASES)
+    def test_fetch_top_stories(self, monkeypatch, task_kwargs, outcome, expected_limit):
+        """Test the Celery wrapper applies its default limit and propagates client errors."""
+        fake_client = FakeHackerNewsClient(outcome)
+        monkeypatch.setattr(ft, "hacker_news_client", fake_client)
         
-        assert result == []
+        if isinstance(outcome, Exception):
+            with pytest.raises(Exception, match=str(outcome)):
+                fetch_top_stories(**task_kwargs)
+        else:
+            assert fetch_top_stories(**task_kwargs) == outcome
+        
+        assert fake_client.calls == [expected_limit]
 
 
 class TestFetchItemDetailsTask:
     """Test fetch_item_details Celery task."""
 
-    def test_fetch_item_details_success(self, celery_test_app):
-        """Test successful fetch_item_details task execution."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.get_items_batch = AsyncMock(return_value=[
-                {"id": 1, "title": "Story 1", "score": 100},
-                {"id": 2, "title": "Story 2", "score": 200}
-            ])
-            
-            result = fetch_item_details([1, 2])
+    @pytest.mark.parametrize("item_ids,outcome", ITEM_DETAILS_CASES)
+    def test_fetch_item_details(self, monkeypatch, item_ids, outcome):
+        """Test fetch_item_details returns the client's items as-is or propagates its error."""
+        fake_client = FakeHackerNewsClient(outcome)
+        monkeypatch.setattr(ft, "hacker_news_client", fake_client)
         
-        assert len(result) == 2
-        assert result[0]["id"] == 1
-        assert result[1]["id"] == 2
-        mock_client.get_items_batch.assert_called_once_with([1, 2])
-
-    def test_fetch_item_details_empty_list(self, celery_test_app):
-        """Test fetch_item_details with empty item IDs list."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.get_items_batch = AsyncMock(return_value=[])
-            
-            result = fetch_item_details([])
+        if isinstance(outcome, Exception):
+            with pytest.raises(Exception, match=str(outcome)):
+                fetch_item_details(item_ids)
+        else:
+            assert fetch_item_details(item_ids) == outcome
         
-        assert result == []
-        mock_client.get_items_batch.assert_called_once_with([])
-
-    def test_fetch_item_details_api_error(self, celery_test_app):
-        """Test fetch_item_details when API call fails."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.get_items_batch = AsyncMock(side_effect=Exception("API Error"))
-            
-            with pytest.raises(Exception, match="API Error"):
-                fetch_item_details([1, 2])
-
-    def test_fetch_item_details_partial_failure(self, celery_test_app):
-        """Test fetch_item_details when some items fail to fetch."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            # Mock that some items return None (failed to fetch)
-            mock_client.get_items_batch = AsyncMock(return_value=[
-                {"id": 1, "title": "Story 1", "score": 100},
-                None,  # Failed to fetch
-                {"id": 3, "title": "Story 3", "score": 300}
-            ])
-            
-            result = fetch_item_details([1, 2, 3])
-        
-        assert len(result) == 3
-        assert result[0]["id"] == 1
-        assert result[1] is None
-        assert result[2]["id"] == 3
+        assert fake_client.calls == [item_ids]
 
 
 class TestProcessAndStoreItemsTask:
     """Test process_and_store_items Celery task."""
 
-    def test_process_and_store_items_success(self, celery_test_app, mock_session_local_for_tasks):
+    def test_process_and_store_items_success(self, monkeypatch, mock_session_local_for_tasks):
         """Test successful process_and_store_items task execution."""
-        items = [
-            {"id": 1, "title": "Story 1", "score": 100, "author": "user1"},
-            {"id": 2, "title": "Story 2", "score": 200, "author": "user2"}
-        ]
+        items = _PROCESS_ITEMS
         
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.filter_items.return_value = items
-            
-            with patch('app.tasks.fetch_tasks.data_service') as mock_service:
-                mock_response = MagicMock()
-                mock_response.stored_count = 2
-                mock_response.new_items = 2
-                mock_response.updated_items = 0
-                mock_service.store_items.return_value = mock_response
-                
-                result = process_and_store_items(items, min_score=50, keyword="test")
-        
-        assert result["items_processed"] == 2
-        assert result["items_filtered"] == 2
-        assert result["items_stored"] == 2
+        mock_client = MagicMock()
+        monkeypatch.setattr(ft, "hacker_news_client", mock_client)
+        mock_client.filter_items.return_value = items
+        
+        mock_service = MagicMock()
+        monkeypatch.setattr(ft, "data_service", mock_service)
+        mock_response = SimpleNamespace(stored_count=2, new_items=2, updated_items=0)
+        mock_service.store_items.return_value = mock_response
+        
+        result = process_and_store_items(items, min_score=50, keyword="test")
+        
+        assert _result_summary(result) == (2, 2, 2, {"min_score": 50, "keyword": "test"})
         assert result["new_items"] == 2
         assert result["updated_items"] == 0
-        assert result["filters_applied"]["min_score"] == 50
-        assert result["filters_applied"]["keyword"] == "test"
 
-    def test_process_and_store_items_empty_list(self, celery_test_app, mock_session_local_for_tasks):
+    def test_process_and_store_items_empty_list(self, monkeypatch, mock_session_local_for_tasks):
         """Test process_and_store_items with empty items list."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.filter_items.return_value = []
-            
-            with patch('app.tasks.fetch_tasks.data_service') as mock_service:
-                mock_response = MagicMock()
-                mock_response.stored_count = 0
-                mock_response.new_items = 0
-                mock_response.updated_items = 0
-                mock_service.store_items.return_value = mock_response
-                
-                result = process_and_store_items([], min_score=50, keyword="test")
-        
-        assert result["items_processed"] == 0
-        assert result["items_filtered"] == 0
-        assert result["items_stored"] == 0
-
-    def test_process_and_store_items_with_filters(self, celery_test_app, mock_session_local_for_tasks):
+        mock_client = MagicMock()
+        monkeypatch.setattr(ft, "hacker_news_client", mock_client)
+        mock_client.filter_items.return_value = []
+        
+        mock_service = MagicMock()
+        monkeypatch.setattr(ft, "data_service", mock_service)
+        mock_response = SimpleNamespace(stored_count=0, new_items=0, updated_items=0)
+        mock_service.store_items.return_value = mock_response
+        
+        result = process_and_store_items([], min_score=50, keyword="test")
+        
+        assert _result_summary(result) == (0, 0, 0, {"min_score": 50, "keyword": "test"})
+
+    def test_process_and_store_items_with_filters(self, monkeypatch, mock_session_local_for_tasks):
         """Test process_and_store_items with filtering applied."""
-        items = [
-            {"id": 1, "title": "Python Story", "score": 100, "author": "user1"},
-            {"id": 2, "title": "JavaScript Story", "score": 50, "author": "user2"},
-            {"id": 3, "title": "Python Guide", "score": 150, "author": "user3"}
-        ]
-        
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            # Mock filtering to return only Python stories with score >= 100
-            mock_client.filter_items.return_value = [
-                {"id": 1, "title": "Python Story", "score": 100, "author": "user1"},
-                {"id": 3, "title": "Python Guide", "score": 150, "author": "user3"}
-            ]
-            
-            with patch('app.tasks.fetch_tasks.data_service') as mock_service:
-                mock_response = MagicMock()
-                mock_response.stored_count = 2
-                mock_response.new_items = 2
-                mock_response.updated_items = 0
-                mock_service.store_items.return_value = mock_response
-                
-                result = process_and_store_items(items, min_score=100, keyword="Python")
-        
-        assert result["items_processed"] == 3
-        assert result["items_filtered"] == 2
-        assert result["items_stored"] == 2
-        assert result["filters_applied"]["min_score"] == 100
-        assert result["filters_applied"]["keyword"] == "Python"
-
-    def test_process_and_store_items_database_error(self, celery_test_app, mock_session_local_for_tasks):
+        items = _PROCESS_FILTER_ITEMS
+        
+        mock_client = MagicMock()
+        monkeypatch.setattr(ft, "hacker_news_client", mock_client)
+        # Mock filtering to return only Python stories with score >= 100
+        mock_client.filter_items.return_value = [items[0], items[2]]
+        
+        mock_service = MagicMock()
+        monkeypatch.setattr(ft, "data_service", mock_service)
+        mock_response = SimpleNamespace(stored_count=2, new_items=2, updated_items=0)
+        mock_service.store_items.return_value = mock_response
+        
+        result = process_and_store_items(items, min_score=100, keyword="Python")
+        
+        assert _result_summary(result) == (3, 2, 2, {"min_score": 100, "keyword": "Python"})
+
+    def test_process_and_store_items_database_error(self, monkeypatch, mock_session_local_for_tasks):
         """Test process_and_store_items when database operations fail."""
         items = [{"id": 1, "title": "Story 1", "score": 100}]
         
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.filter_items.return_value = items
-            
-            with patch('app.tasks.fetch_tasks.data_service') as mock_service:
-                mock_service.store_items.side_effect = Exception("Database error")
-                
-                with pytest.raises(Exception, match="Database error"):
-                    process_and_store_items(items)
+        mock_client = MagicMock()
+        monkeypatch.setattr(ft, "hacker_news_client", mock_client)
+        mock_client.filter_items.return_value = items
+        
+        mock_service = MagicMock()
+        monkeypatch.setattr(ft, "data_service", mock_service)
+        mock_service.store_items.side_effect = Exception("Database error")
+        
+        with pytest.raises(Exception, match="Database error"):
+            process_and_store_items(items)
 
 
 class TestFetchAndProcessPipelineTask:
     """Test fetch_and_process_pipeline Celery task."""
 
-    def test_fetch_and_process_pipeline_success(self, celery_test_app):
-        """Test successful pipeline execution."""
-        # Mock all the sub-tasks
-        with patch('app.tasks.fetch_tasks.fetch_top_stories') as mock_fetch_stories:
-            mock_fetch_stories.return_value = [1, 2, 3]
-            
-            with patch('app.tasks.fetch_tasks.fetch_item_details') as mock_fetch_details:
-                mock_fetch_details.return_value = [
-                    {"id": 1, "title": "Story 1", "score": 100},
-                    {"id": 2, "title": "Story 2", "score": 200},
-                    {"id": 3, "title": "Story 3", "score": 150}
-                ]
-                
-                with patch('app.tasks.fetch_tasks.process_and_store_items') as mock_process:
-                    mock_process.return_value = {
-                        "items_processed": 3,
-                        "items_filtered": 2,
-                        "items_stored": 2,
-                        "new_items": 2,
-                        "updated_items": 0,
-                        "filters_applied": {"min_score": 100, "keyword": None}
-                    }
-                    
-                    with patch('app.tasks.fetch_tasks.update_task_status') as mock_update:
-                        result = fetch_and_process_pipeline(min_score=100, keyword=None, limit=3)
-        
-        expected_result = {
-            "items_processed": 3,
-            "items_filtered": 2,
-            "items_stored": 2,
-            "new_items": 2,
-            "updated_items": 0,
-            "filters_applied": {"min_score": 100, "keyword": None},
-            "pipeline_task_id": result["pipeline_task_id"],  # Use actual task ID
-            "total_stories_fetched": 3,
-            "total_items_processed": 3
+    @pytest.mark.parametrize("task_kwargs,outcomes,error", PIPELINE_CASES)
+    def test_fetch_and_process_pipeline(self, pipeline_mocks, task_kwargs, outcomes, error):
+        """Test the pipeline merges sub-task results or propagates the first sub-task error."""
+        for name, outcome in outcomes.items():
+            if isinstance(outcome, Exception):
+                pipeline_mocks[name].side_effect = outcome
+            else:
+                pipeline_mocks[name].return_value = dict(outcome) if isinstance(outcome, MappingProxyType) else outcome
+        
+        if error:
+            with pytest.raises(Exception, match=error):
+                fetch_and_process_pipeline(**task_kwargs)
+            return
+        
+        result = fetch_and_process_pipeline(**task_kwargs)
+        
+        # Compare against the frozen sub-task result in place instead of building an expected dict
+        assert result.items() >= outcomes["process_and_store_items"].items()
+        assert result.keys() - outcomes["process_and_store_items"].keys() == {
+            "pipeline_task_id", "total_stories_fetched", "total_items_processed"
         }
+        assert _pipeline_totals(result) == (len(outcomes["fetch_top_stories"]), len(outcomes["fetch_item_details"]))
+
+
+    @pytest.mark.parametrize("fails", [False, True], ids=["success", "failure"])
+    def test_fetch_and_process_pipeline_releases_own_lock(self, pipeline_mocks, mock_cache, fails):
+        """Test the pipeline releases the fetch lock it was enqueued under, whether it succeeds or fails."""
+        lock_key = ft._fetch_lock_key(100, None, 3)
+        mock_cache.add(lock_key, "pipeline-task-1")
+        pipeline_mocks["fetch_top_stories"].return_value = [item["id"] for item in _PIPELINE_ITEMS]
+        pipeline_mocks["fetch_item_details"].return_value = _PIPELINE_ITEMS
+        pipeline_mocks["process_and_store_items"].return_value = dict(_PIPELINE_RESULT)
+        if fails:
+            pipeline_mocks["fetch_top_stories"].side_effect = Exception("Fetch error")
+            with pytest.raises(Exception, match="Fetch error"):
+                fetch_and_process_pipeline.apply(args=[100, None, 3], task_id="pipeline-task-1")
+        else:
+            fetch_and_process_pipeline.apply(args=[100, None, 3], task_id="pipeline-task-1")
         
-        assert result == expected_result
-
-    def test_fetch_and_process_pipeline_with_filters(self, celery_test_app):
-        """Test pipeline execution with filtering parameters."""
-        with patch('app.tasks.fetch_tasks.fetch_top_stories') as mock_fetch_stories:
-            mock_fetch_stories.return_value = [1, 2, 3, 4, 5]
-            
-            with patch('app.tasks.fetch_tasks.fetch_item_details') as mock_fetch_details:
-                mock_fetch_details.return_value = [
-                    {"id": 1, "title": "Python Story", "score": 100},
-                    {"id": 2, "title": "JavaScript Story", "score": 50},
-                    {"id": 3, "title": "Python Guide", "score": 150},
-                    {"id": 4, "title": "Java Story", "score": 80},
-                    {"id": 5, "title": "Python Tutorial", "score": 200}
-                ]
-                
-                with patch('app.tasks.fetch_tasks.process_and_store_items') as mock_process:
-                    mock_process.return_value = {
-                        "items_processed": 5,
-                        "items_filtered": 3,
-                        "items_stored": 3,
-                        "new_items": 3,
-                        "updated_items": 0,
-                        "filters_applied": {"min_score": 100, "keyword": "Python"}
-                    }
-                    
-                    with patch('app.tasks.fetch_tasks.update_task_status') as mock_update:
-                        result = fetch_and_process_pipeline(min_score=100, keyword="Python", limit=5)
-        
-        assert result["items_processed"] == 5
-        assert result["items_filtered"] == 3
-        assert result["items_stored"] == 3
-        assert result["filters_applied"]["min_score"] == 100
-        assert result["filters_applied"]["keyword"] == "Python"
-
-    def test_fetch_and_process_pipeline_fetch_error(self, celery_test_app):
-        """Test pipeline when fetch_top_stories fails."""
-        with patch('app.tasks.fetch_tasks.fetch_top_stories') as mock_fetch_stories:
-            mock_fetch_stories.side_effect = Exception("Fetch error")
-            
-            with patch('app.tasks.fetch_tasks.update_task_status') as mock_update:
-                with pytest.raises(Exception, match="Fetch error"):
-                    fetch_and_process_pipeline()
-
-    def test_fetch_and_process_pipeline_details_error(self, celery_test_app):
-        """Test pipeline when fetch_item_details fails."""
-        with patch('app.tasks.fetch_tasks.fetch_top_stories') as mock_fetch_stories:
-            mock_fetch_stories.return_value = [1, 2, 3]
-            
-            with patch('app.tasks.fetch_tasks.fetch_item_details') as mock_fetch_details:
-                mock_fetch_details.side_effect = Exception("Details error")
-                
-                with patch('app.tasks.fetch_tasks.update_task_status') as mock_update:
-                    with pytest.raises(Exception, match="Details error"):
-                        fetch_and_process_pipeline()
-
-    def test_fetch_and_process_pipeline_process_error(self, celery_test_app):
-        """Test pipeline when process_and_store_items fails."""
-        with patch('app.tasks.fetch_tasks.fetch_top_stories') as mock_fetch_stories:
-            mock_fetch_stories.return_value = [1, 2, 3]
-            
-            with patch('app.tasks.fetch_tasks.fetch_item_details') as mock_fetch_details:
-                mock_fetch_details.return_value = [{"id": 1, "title": "Story 1"}]
-                
-                with patch('app.tasks.fetch_tasks.process_and_store_items') as mock_process:
-                    mock_process.side_effect = Exception("Process error")
-                    
-                    with patch('app.tasks.fetch_tasks.update_task_status') as mock_update:
-                        with pytest.raises(Exception, match="Process error"):
-                            fetch_and_process_pipeline()
+        assert mock_cache.get(lock_key) is None
+
+    def test_fetch_and_process_pipeline_leaves_other_tasks_lock(self, pipeline_mocks, mock_cache):
+        """Test runs not holding the fetch lock (another task, or a direct scheduled call) leave it in place."""
+        lock_key = ft._fetch_lock_key(100, None, 3)
+        mock_cache.add(lock_key, "api-task-1")
+        pipeline_mocks["fetch_top_stories"].return_value = [item["id"] for item in _PIPELINE_ITEMS]
+        pipeline_mocks["fetch_item_details"].return_value = _PIPELINE_ITEMS
+        pipeline_mocks["process_and_store_items"].side_effect = lambda *args: dict(_PIPELINE_RESULT)
+        
+        fetch_and_process_pipeline.apply(args=[100, None, 3], task_id="other-task-1")
+        fetch_and_process_pipeline(100, None, 3)
+        
+        assert mock_cache.get(lock_key) == "api-task-1"
 
 
 class TestScheduledFetchTask:
     """Test scheduled_fetch_task Celery task."""
 
-    def test_scheduled_fetch_task_success(self, celery_test_app):
+    def test_scheduled_fetch_task_success(self):
         """Test successful scheduled fetch task execution."""
-        with patch('app.tasks.fetch_tasks.fetch_and_process_pipeline') as mock_pipeline:
-            mock_pipeline.return_value = {
-                "items_processed": 10,
-                "items_filtered": 8,
-                "items_stored": 8,
-                "new_items": 8,
-                "updated_items": 0,
-                "filters_applied": {"min_score": 50, "keyword": "AI"}
-            }
+        with patch.object(ft, "fetch_and_process_pipeline") as mock_pipeline:
+            mock_pipeline.return_value = dict(_SCHEDULED_RESULT)
             
             result = scheduled_fetch_task(min_score=50, keyword="AI", limit=100)
         
-        expected_result = {
-            "items_processed": 10,
-            "items_filtered": 8,
-            "items_stored": 8,
-            "new_items": 8,
-            "updated_items": 0,
-            "filters_applied": {"min_score": 50, "keyword": "AI"},
-            "scheduled_task_id": result["scheduled_task_id"],  # Use actual task ID
-            "scheduled_at": result["scheduled_at"]  # This will be set by the task
-        }
-        
-        assert result["items_processed"] == expected_result["items_processed"]
-        assert result["scheduled_task_id"] == expected_result["scheduled_task_id"]
-        assert "scheduled_at" in result
+        # Every pipeline field passes through unchanged, plus the scheduling metadata
+        assert result.items() >= _SCHEDULED_RESULT.items()
+        assert result.keys() - _SCHEDULED_RESULT.keys() == {"scheduled_task_id", "scheduled_at"}
 
-    def test_scheduled_fetch_task_with_filters(self, celery_test_app):
+    def test_scheduled_fetch_task_with_filters(self):
         """Test scheduled fetch task with filtering parameters."""
-        with patch('app.tasks.fetch_tasks.fetch_and_process_pipeline') as mock_pipeline:
-            mock_pipeline.return_value = {
-                "items_processed": 5,
-                "items_filtered": 3,
-                "items_stored": 3,
-                "new_items": 3,
-                "updated_items": 0,
-                "filters_applied": {"min_score": 100, "keyword": "Python"}
-            }
+        with patch.object(ft, "fetch_and_process_pipeline") as mock_pipeline:
+            mock_pipeline.return_value = dict(_PIPELINE_FILTER_RESULT)
             
             result = scheduled_fetch_task(min_score=100, keyword="Python", limit=50)
         
-        assert result["items_processed"] == 5
-        assert result["items_filtered"] == 3
-        assert result["items_stored"] == 3
-        assert result["filters_applied"]["min_score"] == 100
-        assert result["filters_applied"]["keyword"] == "Python"
+        assert _result_summary(result) == (5, 3, 3, {"min_score": 100, "keyword": "Python"})
 
-    def test_scheduled_fetch_task_pipeline_error(self, celery_test_app):
+    def test_scheduled_fetch_task_pipeline_error(self):
         """Test scheduled fetch task when pipeline fails."""
-        with patch('app.tasks.fetch_tasks.fetch_and_process_pipeline') as mock_pipeline:
+        with patch.object(ft, "fetch_and_process_pipeline") as mock_pipeline:
             mock_pipeline.side_effect = Exception("Pipeline error")
             
             with pytest.raises(Exception, match="Pipeline error"):
@@ -376,9 +383,9 @@ class TestScheduledFetchTask:
 class TestTaskStatusManagement:
     """Test task status management functions."""
 
-    def test_update_task_status(self, celery_test_app):
+    def test_update_task_status(self):
         """Test updating task status."""
-        with patch('app.tasks.fetch_tasks.cache') as mock_cache:
+        with patch.object(ft, "cache") as mock_cache:
             mock_cache.get.return_value = None  # No existing status
             
             update_task_status("test-task-id", "processing", 50, "Processing items")
@@ -392,7 +399,7 @@ class TestTaskStatusManagement:
             assert call_args[0][1]["progress"] == 50
             assert call_args[0][1]["message"] == "Processing items"
 
-    def test_update_task_status_existing(self, celery_test_app):
+    def test_update_task_status_existing(self):
         """Test updating existing task status."""
         existing_status = {
             "task_id": "test-task-id",
@@ -403,7 +410,7 @@ class TestTaskStatusManagement:
             "updated_at": "2024-01-01T00:00:00Z"
         }
         
-        with patch('app.tasks.fetch_tasks.cache') as mock_cache:
+        with patch.object(ft, "cache") as mock_cache:
             mock_cache.get.return_value = existing_status
             
             update_task_status("test-task-id", "completed", 100, "Task completed")
@@ -417,7 +424,7 @@ class TestTaskStatusManagement:
             assert updated_status["message"] == "Task completed"
             assert updated_status["created_at"] == "2024-01-01T00:00:00Z"  # Should not change
 
-    def test_get_task_status(self, celery_test_app):
+    def test_get_task_status(self):
         """Test getting task status."""
         expected_status = {
             "task_id": "test-task-id",
@@ -426,7 +433,7 @@ class TestTaskStatusManagement:
             "message": "Task completed"
         }
         
-        with patch('app.tasks.fetch_tasks.cache') as mock_cache:
+        with patch.object(ft, "cache") as mock_cache:
             mock_cache.get.return_value = expected_status
             
             result = get_task_status("test-task-id")
@@ -434,9 +441,9 @@ class TestTaskStatusManagement:
         assert result == expected_status
         mock_cache.get.assert_called_once_with("task:test-task-id")
 
-    def test_get_task_status_not_found(self, celery_test_app):
+    def test_get_task_status_not_found(self):
         """Test getting task status when not found."""
-        with patch('app.tasks.fetch_tasks.cache') as mock_cache:
+        with patch.object(ft, "cache") as mock_cache:
             mock_cache.get.return_value = None
             
             result = get_task_status("non-existent-task")
@@ -444,16 +451,59 @@ class TestTaskStatusManagement:
         assert result is None
 
 
+class TestEnqueueFetchPipeline:
+    """Test in-flight deduplication when enqueuing the fetch pipeline."""
+
+    def test_enqueue_reuses_inflight_task(self, mock_cache):
+        """Test an identical fetch returns the in-flight task instead of enqueuing again."""
+        with patch.object(ft.fetch_and_process_pipeline, "apply_async") as mock_apply_async:
+            task_id, started = enqueue_fetch_pipeline(100, "Python", 50)
+            second = enqueue_fetch_pipeline(100, "Python", 50)
+
+        assert started is True
+        assert second == (task_id, False)
+        mock_apply_async.assert_called_once_with(args=[100, "Python", 50], task_id=task_id)
+
+    def test_enqueue_concurrent_caller_gets_task_id_before_enqueue_returns(self, mock_cache):
+        """Test a caller arriving while the winner is still enqueuing reuses the winner's task ID."""
+        concurrent = []
+
+        def enqueue_during_apply(*args, **kwargs):
+            concurrent.append(enqueue_fetch_pipeline(100, "Python", 50))
+
+        with patch.object(ft.fetch_and_process_pipeline, "apply_async", side_effect=enqueue_during_apply) as mock_apply_async:
+            task_id, started = enqueue_fetch_pipeline(100, "Python", 50)
+
+        assert started is True
+        assert concurrent == [(task_id, False)]
+        mock_apply_async.assert_called_once()
+
+    def test_enqueue_releases_lock_on_error(self, mock_cache):
+        """Test a failed enqueue releases the lock so the fetch can be retried."""
+        with patch.object(ft.fetch_and_process_pipeline, "apply_async") as mock_apply_async:
+            mock_apply_async.side_effect = [Exception("Celery error"), None]
+
+            with pytest.raises(Exception, match="Celery error"):
+                enqueue_fetch_pipeline(100, "Python", 50)
+
+            task_id, started = enqueue_fetch_pipeline(100, "Python", 50)
+
+        assert started is True
+        assert mock_cache.get(ft._fetch_lock_key(100, "Python", 50)) == task_id
+        assert mock_apply_async.call_count == 2
+
+
 class TestTasksWithDatabase:
     """Test Celery tasks that require database access."""
     
-    def test_process_and_store_items_with_database(self, celery_test_app, mock_session_local_for_tasks, sample_hacker_news_items):
+    def test_process_and_store_items_with_database(self, monkeypatch, mock_session_local_for_tasks, sample_hacker_news_items):
         """Test process_and_store_items task with actual database operations."""
-        with patch('app.tasks.fetch_tasks.hacker_news_client') as mock_client:
-            mock_client.filter_items.return_value = sample_hacker_news_items
-            
-            # Execute the task
-            result = process_and_store_items(sample_hacker_news_items, min_score=50, keyword="AI")
+        mock_client = MagicMock()
+        monkeypatch.setattr(ft, "hacker_news_client", mock_client)
+        mock_client.filter_items.return_value = sample_hacker_news_items
+        
+        # Execute the task
+        result = process_and_store_items(sample_hacker_news_items, min_score=50, keyword="AI")
         
         # Verify the result
         assert result["items_processed"] == len(sample_hacker_news_items)
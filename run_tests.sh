@@ -106,9 +106,17 @@ run_category() {
             print_status "Running fast tests (unit tests only)..."
             python -m pytest app/tests/test_domain_logic.py app/tests/test_repositories.py app/tests/test_services.py -v --tb=short
             ;;
+        "slow")
+            print_status "Running slow benchmark tests..."
+            python -m pytest app/tests/ -v -m slow --runslow
+            ;;
+        "parallel")
+            print_status "Running all tests in parallel (pytest-xdist, Celery task tests pinned to one worker)..."
+            python -m pytest app/tests/ -n auto --dist=loadgroup
+            ;;
         *)
             print_error "Unknown category: $category"
-            echo "Available categories: unit, tasks, integration, api, fast"
+            echo "Available categories: unit, tasks, integration, api, fast, slow, parallel"
             exit 1
             ;;
     esac
@@ -142,6 +150,8 @@ show_help() {
     echo "  integration  Run integration tests only"
     echo "  api          Run API tests only"
     echo "  fast         Run fast tests (unit tests with short output)"
+    echo "  slow         Run slow benchmark tests (marked slow, skipped by default)"
+    echo "  parallel     Run all tests across CPU cores with pytest-xdist"
     echo "  coverage     Run all tests with coverage report"
     echo "  help         Show this help message"
     echo
@@ -156,7 +166,7 @@ case "${1:-}" in
     "all")
         run_all
         ;;
-    "unit"|"tasks"|"integration"|"api"|"fast")
+    "unit"|"tasks"|"integration"|"api"|"fast"|"slow"|"parallel")
         run_category "$1"
         ;;
     "coverage")